@@ -2,4 +2,5 @@ from setuptools import setup, find_packages
 
 setup(name='square_roots', author="Lulof Pirée",
       version='0.1', author_email="lulof.piree@zoho,com",
-      packages=find_packages(include=["square_roots", "square_roots.*"]))
\ No newline at end of file
+      packages=find_packages(include=["square_roots", "square_roots.*"]),
+      extras_require={"numpy": ["numpy"]})
\ No newline at end of file
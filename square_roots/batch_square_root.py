@@ -0,0 +1,121 @@
+"""
+Copyright (C) 2021 Lulof Pirée, 
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+Square roots of many numbers at once, using NumPy.
+
+The same long-division recurrence as SquareRootState.advance()
+is run for all inputs in lockstep.
+The roots and remainders grow beyond 64 bits,
+so they are stored in NumPy arrays of Python ints (dtype=object):
+every arithmetic operation is then a single loop in C over all inputs,
+instead of one interpreted loop per input.
+"""
+from __future__ import annotations
+import math
+from typing import Sequence
+
+import numpy as np
+
+from square_roots.compute_square_root import Number, to_ratio
+
+_isqrt = np.frompyfunc(math.isqrt, 1, 1)
+
+# Digit matrices with values of at least this size use dtype=object.
+_INT64_LIMIT = 2**63
+
+
+def compute_square_roots(ks: Sequence[Number] | np.ndarray, num_digits: int,
+                         base: int = 10) -> np.ndarray:
+    """
+    Compute the first [num_digits] digits of sqrt(k) for every k in ks.
+
+    Arguments:
+    * ks: sequence or 1D NumPy array of nonnegative numbers,
+        see to_ratio() for the accepted types.
+    * num_digits: amount of digits to compute per number.
+    * base: base of the digits, 2 ≤ base ≤ 34.
+
+    Returns a matrix of shape (len(ks), num_digits).
+    Row i holds the digits of sqrt(ks[i]) as computed by
+    SquareRootState.iter_digits(): the first column is the whole
+    integer part, the other columns are the decimals.
+    The dtype is int64, unless some integer part does not fit in it.
+    """
+    if base < 2 or base > 34:
+        raise ValueError("Base must be an integer in [2, 34]")
+    if num_digits < 1:
+        raise ValueError("Must compute at least one digit.")
+    # np.asarray() would coerce mixed inputs to a single dtype,
+    # e.g. a float next to a string to a string.
+    if isinstance(ks, np.ndarray):
+        ks = ks.ravel().tolist()
+    else:
+        ks = list(ks)
+    numerators = np.empty(len(ks), dtype=object)
+    denominators = np.empty(len(ks), dtype=object)
+    for i, k in enumerate(ks):
+        numerators[i], denominators[i] = to_ratio(k, base)
+    if np.any(numerators < 0):
+        raise ValueError("Cannot compute the square root of a negative number.")
+
+    # Integer part: floor(sqrt(k)) == isqrt(floor(k)).
+    scaled_k = numerators // denominators
+    pair_remainders = numerators % denominators
+    roots = _isqrt(scaled_k).astype(object)
+    remainders = scaled_k - roots*roots
+
+    if len(ks) > 0 and np.max(roots) >= _INT64_LIMIT:
+        digits = np.zeros((len(ks), num_digits), dtype=object)
+    else:
+        digits = np.zeros((len(ks), num_digits), dtype=np.int64)
+    digits[:, 0] = roots
+
+    square_base = base*base
+    for i in range(1, num_digits):
+        # Next 'pair' of digits of every k.
+        pair_remainders = pair_remainders * square_base
+        pairs = pair_remainders // denominators
+        pair_remainders = pair_remainders % denominators
+        remainders = remainders*square_base + pairs
+        twice_roots = 2*base*roots
+        new_digits = _select_digits(remainders, twice_roots, base)
+        remainders = remainders - new_digits*(twice_roots + new_digits)
+        roots = roots*base + new_digits
+        digits[:, i] = new_digits
+    return digits
+
+
+def _select_digits(remainders: np.ndarray, twice_roots: np.ndarray,
+                   base: int) -> np.ndarray:
+    """
+    Vectorized version of compute_square_root._select_digit():
+    return for every index the greatest digit d < base with
+    d*(twice_roots + d) ≤ remainders.
+    """
+    is_zero = twice_roots == 0
+    highs = np.where(is_zero, base - 1,
+                     remainders // np.where(is_zero, 1, twice_roots))
+    highs = np.minimum(highs, base - 1)
+    lows = np.where(is_zero, 0, remainders // (twice_roots + base))
+    lows = np.minimum(lows, highs)
+    unresolved = lows < highs
+    while np.any(unresolved):
+        middles = (lows + highs + 1) // 2
+        fits = middles*(twice_roots + middles) <= remainders
+        lows = np.where(unresolved & fits, middles, lows)
+        highs = np.where(unresolved & ~fits, middles - 1, highs)
+        unresolved = lows < highs
+    return lows
@@ -0,0 +1,135 @@
+"""
+Copyright (C) 2021 Lulof Pirée, 
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+Checkpoint files for long-running square root computations.
+
+A checkpoint stores a SquareRootState, which contains all digits
+computed so far (as the int root), and the input k to check
+that a checkpoint belongs to the computation that loads it.
+
+File format: the magic bytes b"SQRT1", followed by the ints
+k_numerator, k_denominator, base, position, denominator,
+pair_remainder, root and remainder.
+Every int is stored as an 8-byte little-endian length n
+followed by n bytes of its little-endian binary representation,
+so writing a checkpoint is linear in the amount of digits.
+"""
+from fractions import Fraction
+import os
+import struct
+from typing import BinaryIO, Optional
+
+from square_roots.compute_square_root import (Number,
+                                              SquareRootState,
+                                              _check_arguments,
+                                              _format_root,
+                                              to_fraction)
+
+_MAGIC = b"SQRT1"
+_LENGTH = struct.Struct("<Q")
+
+
+def compute_square_root_resumable(num_digits: int, k: Number, base: int,
+                                  checkpoint_path: str,
+                                  checkpoint_interval: int = 10000) -> str:
+    """
+    Same as compute_square_root(num_digits, k, base),
+    but write the state to checkpoint_path
+    every [checkpoint_interval] digits.
+    If checkpoint_path already holds a checkpoint of sqrt(k) in this base,
+    continue from there instead of starting at the first digit.
+
+    The checkpoint file is kept after the computation finishes,
+    so a later call asking for more digits continues from it as well.
+    """
+    ratio = _check_arguments(num_digits, k, base)
+    if checkpoint_interval < 1:
+        raise ValueError("Checkpoint interval must be at least 1.")
+    k = Fraction(*ratio)
+    state = load_checkpoint(checkpoint_path, k, base)
+    if state is None:
+        state = SquareRootState._from_ratio(ratio, base)
+    while state.position < num_digits:
+        state.advance(min(checkpoint_interval, num_digits - state.position))
+        save_checkpoint(checkpoint_path, k, state)
+    root = state.root // base**(state.position - num_digits)
+    return _format_root(root, num_digits, base)
+
+
+def save_checkpoint(path: str, k: Number, state: SquareRootState):
+    """
+    Write state, the computation of sqrt(k), to the file at path.
+    The file is replaced atomically,
+    so an interrupted write leaves the previous checkpoint intact.
+    """
+    numerator, denominator = to_fraction(k, state.base).as_integer_ratio()
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(_MAGIC)
+        for value in (numerator, denominator, state.base, state.position,
+                      state.denominator, state.pair_remainder, state.root,
+                      state.remainder):
+            _write_int(file, value)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+
+
+def load_checkpoint(path: str, k: Number,
+                    base: int) -> Optional[SquareRootState]:
+    """
+    Return the SquareRootState stored in the file at path,
+    or None if there is no such file.
+
+    Raise a ValueError if the file is not a checkpoint
+    of the computation of sqrt(k) in the given base.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as file:
+        if file.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"{path} is not a square root checkpoint.")
+        values = [_read_int(file) for _ in range(8)]
+    (numerator, denominator, stored_base, position, state_denominator,
+     pair_remainder, root, remainder) = values
+    if (to_fraction(k, base).as_integer_ratio() != (numerator, denominator)
+            or stored_base != base):
+        raise ValueError(f"{path} is a checkpoint of another computation.")
+
+    state = SquareRootState(k, base)
+    state.position = position
+    state.denominator = state_denominator
+    state.pair_remainder = pair_remainder
+    state.root = root
+    state.remainder = remainder
+    return state
+
+
+def _write_int(file: BinaryIO, value: int):
+    data = value.to_bytes((value.bit_length() + 7) // 8, "little")
+    file.write(_LENGTH.pack(len(data)))
+    file.write(data)
+
+
+def _read_int(file: BinaryIO) -> int:
+    header = file.read(_LENGTH.size)
+    if len(header) != _LENGTH.size:
+        raise ValueError("Truncated square root checkpoint.")
+    (length,) = _LENGTH.unpack(header)
+    data = file.read(length)
+    if len(data) != length:
+        raise ValueError("Truncated square root checkpoint.")
+    return int.from_bytes(data, "little")
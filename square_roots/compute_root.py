@@ -0,0 +1,200 @@
+"""
+Copyright (C) 2021 Lulof Pirée, 
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+Digits of nth roots and rational powers k**(p/q).
+
+Uses the same two engines as compute_square_root:
+* Digit by digit, keeping the invariant
+    remainder = scaled_k - root**n,
+  where scaled_k = floor(k * base**(n*i)) after i decimals.
+  Appending a digit d to the root gives by binomial expansion
+    (base*root + d)**n - (base*root)**n
+        = sum_{j=1}^{n} C(n, j) * (base*root)**(n-j) * d**j,
+  so the remainder can be updated without computing (base*root + d)**n.
+* For many digits, Newton's method on the integer nth root,
+  which doubles the precision in every step.
+"""
+from __future__ import annotations
+import math
+from typing import List
+
+from square_roots.compute_square_root import (NEWTON_THRESHOLD,
+                                              Number,
+                                              Ratio,
+                                              _check_arguments,
+                                              _format_root,
+                                              _isqrt)
+from square_roots.radix import _floor_divide
+
+
+def compute_root(num_digits: int, k: Number, n: int,
+                 base: int = 10) -> str:
+    """
+    Compute the first [num_digits] of the nth root of k,
+    and return the result as a string.
+
+    Arguments:
+    * num_digits: amount of digits, see compute_square_root().
+    * k: nonnegative number whose nth root is to be approximated.
+        See to_ratio() for the accepted types.
+    * n: degree of the root, n ≥ 1. n=2 gives the square root.
+    * base: base of the output digits, 2 ≤ base ≤ 34.
+    """
+    if n < 1:
+        raise ValueError("Degree of the root must be at least 1.")
+    return _compute_root_of_ratio(num_digits,
+                                  _check_arguments(num_digits, k, base),
+                                  n, base)
+
+
+def _compute_root_of_ratio(num_digits: int, k: Ratio, n: int,
+                           base: int) -> str:
+    """
+    Same as compute_root(), for k as returned by _check_arguments().
+    """
+    if num_digits > NEWTON_THRESHOLD:
+        root = _newton_root(num_digits, k, n, base)
+    else:
+        root = _exact_root(num_digits, k, n, base)
+    return _format_root(root, num_digits, base)
+
+
+def compute_power(num_digits: int, k: Number, p: int, q: int,
+                  base: int = 10) -> str:
+    """
+    Compute the first [num_digits] of k**(p/q),
+    and return the result as a string.
+
+    Arguments:
+    * num_digits: amount of digits, see compute_square_root().
+    * k: nonnegative number, positive if p < 0.
+    * p, q: numerator and denominator of the exponent, q ≥ 1.
+    * base: base of the output digits, 2 ≤ base ≤ 34.
+    """
+    if q < 1:
+        raise ValueError("Denominator of the exponent must be at least 1.")
+    numerator, denominator = _check_arguments(num_digits, k, base)
+    if p < 0:
+        if numerator == 0:
+            raise ValueError("Cannot raise 0 to a negative power.")
+        numerator, denominator = denominator, numerator
+    return _compute_root_of_ratio(
+        num_digits, (numerator**abs(p), denominator**abs(p)), q, base)
+
+
+def _exact_root(num_digits: int, k: Ratio, n: int,
+                base: int) -> int:
+    """
+    Return floor(k**(1/n) * base**(num_digits-1)),
+    computed one digit at a time.
+    """
+    numerator, denominator = k
+    scaled_k, chunk_remainder = divmod(numerator, denominator)
+    root = _iroot(scaled_k, n)
+    remainder = scaled_k - root**n
+    chunk_base = base**n
+
+    for _ in range(num_digits - 1):
+        # Next chunk of n digits of k.
+        chunk, chunk_remainder = divmod(chunk_remainder*chunk_base,
+                                        denominator)
+        remainder = remainder*chunk_base + chunk
+        shifted_root = root*base
+        coefficients = _binomial_coefficients(shifted_root, n)
+        digit = _select_digit(remainder, coefficients, base)
+        remainder -= _increment(coefficients, digit)
+        root = shifted_root + digit
+    return root
+
+
+def _binomial_coefficients(shifted_root: int, n: int) -> List[int]:
+    """
+    Return [C(n, j) * shifted_root**(n-j) for j = n, n-1, ..., 1].
+    """
+    coefficients = []
+    power = 1
+    for j in range(n, 0, -1):
+        coefficients.append(math.comb(n, j) * power)
+        power *= shifted_root
+    return coefficients
+
+
+def _increment(coefficients: List[int], digit: int) -> int:
+    """
+    Return (shifted_root + digit)**n - shifted_root**n
+    for the coefficients of _binomial_coefficients(),
+    using Horner's rule (every step multiplies by a single digit).
+    """
+    result = 0
+    for coefficient in coefficients:
+        result = (result + coefficient) * digit
+    return result
+
+
+def _select_digit(remainder: int, coefficients: List[int], base: int) -> int:
+    """
+    Return the greatest digit d < base with
+    _increment(coefficients, d) ≤ remainder, by bisection.
+    """
+    # The linear term alone already bounds the digit.
+    linear = coefficients[-1]
+    low = 0
+    high = min(remainder // linear, base - 1) if linear > 0 else base - 1
+    while low < high:
+        middle = (low + high + 1) // 2
+        if _increment(coefficients, middle) <= remainder:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _newton_root(num_digits: int, k: Ratio, n: int,
+                 base: int) -> int:
+    """
+    Same as _exact_root(), but computes all digits at once
+    using Newton's method.
+    """
+    numerator, denominator = k
+    scaled_k = _floor_divide(numerator * base**(n*(num_digits - 1)),
+                             denominator)
+    return _iroot(scaled_k, n)
+
+
+def _iroot(a: int, n: int) -> int:
+    """
+    Return floor(a**(1/n)) for a nonnegative int a.
+
+    Computes the root of the leading half of the bits recursively,
+    which gives an upper bound with about half the precision,
+    and then descends to the exact root with Newton's iteration
+        x = ((n-1)*x + a // x**(n-1)) // n.
+    """
+    if n == 1 or a == 0:
+        return a
+    if n == 2:
+        return _isqrt(a)
+    result_bits = a.bit_length() // n
+    if result_bits < 32:
+        guess = 1 << (result_bits + 1)
+    else:
+        shift = result_bits // 2
+        guess = (_iroot(a >> (n*shift), n) + 1) << shift
+    while True:
+        improved = ((n - 1)*guess + _floor_divide(a, guess**(n - 1))) // n
+        if improved >= guess:
+            return guess
+        guess = improved
@@ -14,8 +14,35 @@ GNU Affero General Public License for more details.
 You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+from __future__ import annotations
+from fractions import Fraction
+import math
+from typing import Iterator, List, Tuple, Union
 
-def compute_square_root(num_digits: int, k:float, base:int = 10) -> str:
+from square_roots.decimal_num import (DecimalNumber,
+                                      _decimal_number_from_string)
+from square_roots.digit_to_string import DIGIT_TO_STRING
+from square_roots.radix import _floor_divide, int_to_digits
+
+# Types of k accepted by compute_square_root(), see to_ratio().
+Number = Union[int, float, Fraction, str, DecimalNumber]
+
+# Exact value of k as (numerator, denominator), see to_ratio().
+Ratio = Tuple[int, int]
+
+# Above this many digits, compute_square_root() uses the Newton engine
+# instead of the digit-by-digit engine.
+NEWTON_THRESHOLD = 100
+
+# Below this many bits, math.isqrt() is faster than _isqrt().
+# Measured on CPython 3.11: at 100k bits, math.isqrt() takes 4 ms
+# and _isqrt() 10 ms, they are even at about 1M bits,
+# and at 2M bits math.isqrt() takes 1.5 s and _isqrt() 1.2 s.
+_ISQRT_THRESHOLD = 1_000_000
+
+
+def compute_square_root(num_digits: int, k: Number, base: int = 10,
+                        exact: bool = True) -> str:
     """
     Compute the first [num_digits] of sqrt(k),
     and return the result as a string.
@@ -23,7 +50,14 @@ def compute_square_root(num_digits: int, k:float, base:int = 10) -> str:
     Arguments:
     * num_digits: amount of digits (precision) of the approximation 
         of sqrt(k) in the output string.
+        The first digit is the integer part of sqrt(k),
+        the remaining num_digits-1 digits are decimals.
+        (If sqrt(k) >= base, the exact engine writes
+        the integer part out in full.)
     * k: number whose sqrt(k) is to be approximated.
+        Besides floats, exact inputs are accepted:
+        ints, Fractions, DecimalNumbers and strings such as "1.6a09"
+        (read in the given base). See to_ratio().
     * base: base of the number represented by the output string used.
         base=10 gives a normal number, base=2 a binary number,
         and base=16 a hexadecimal number.
@@ -33,21 +67,369 @@ def compute_square_root(num_digits: int, k:float, base:int = 10) -> str:
         (Higher bases are not supported as there are 
         no more obvious alphabet symbols for it.
         This is just a lack of conventions, not a theoretical one.)
+    * exact: if True (default), use integer arithmetic only,
+        so that every returned digit is correct.
+        If False, use the original float-based algorithm,
+        which computes a single integer digit:
+        it raises a ValueError if sqrt(k) >= base.
 
-    NOTE: Uses build-in float multiplication.
+    For more than NEWTON_THRESHOLD digits,
+    the exact computation uses Newton's method (see _isqrt())
+    instead of computing one digit at a time.
+
+    NOTE: The float-based algorithm (exact=False)
+    uses build-in float multiplication.
     This limits the accuracy to machine precision.
     It suffices to test the method, but is isn't reliable for many digits.
-    A software implementation of multiplication and addition could
-    of course solve this, so it is not a theoretical issue.
+    """
+    k = _check_arguments(num_digits, k, base)
+    if exact:
+        return _format_root(_scaled_square_root(num_digits, k, base),
+                            num_digits, base)
+    else:
+        numerator, denominator = k
+        if numerator >= base**2 * denominator:
+            raise ValueError("The float-based algorithm requires "
+                             "sqrt(k) < base.")
+        return _format_digits(_float_square_root(num_digits,
+                                                 numerator / denominator,
+                                                 base))
+
+
+def _check_arguments(num_digits: int, k: Number, base: int) -> Ratio:
+    """
+    Raise a ValueError if the arguments of compute_square_root()
+    (or compute_root.compute_root()) are out of range.
+    Otherwise return k as a Ratio, see to_ratio().
     """
     if base < 2 or base > 34:
         raise ValueError("Base must be an integer in [2, 34]")
+    if num_digits < 1:
+        raise ValueError("Must compute at least one digit.")
+    ratio = to_ratio(k, base)
+    if ratio[0] < 0:
+        raise ValueError("Cannot compute the root of a negative number.")
+    return ratio
+
+
+def to_fraction(k: Number, base: int = 10) -> Fraction:
+    """
+    Convert k exactly to a Fraction.
+    Same arguments as to_ratio().
+    """
+    return Fraction(*to_ratio(k, base))
+
+
+def to_ratio(k: Number, base: int = 10) -> Ratio:
+    """
+    Convert k exactly to a pair (numerator, denominator)
+    with a positive denominator.
+    Unlike to_fraction(), the pair is not reduced to lowest terms:
+    that takes a gcd, which is quadratic in the size of k,
+    while the root engines only need some exact representation.
+
+    Arguments:
+    * k: an int, float, Fraction or DecimalNumber,
+        or a string "A.B" or "A" of digits in the given base,
+        as accepted by DecimalNumber.from_string().
+        Strings raise the same errors as DecimalNumber.from_string().
+    * base: base of the digits if k is a string, 2 ≤ base ≤ 34.
+    """
+    if isinstance(k, DecimalNumber):
+        return _decimal_number_to_ratio(k)
+    elif isinstance(k, str):
+        return _string_to_ratio(k, base)
+    elif isinstance(k, int):
+        return int(k), 1
+    else:
+        return Fraction(k).as_integer_ratio()
+
+
+def _decimal_number_to_ratio(k: DecimalNumber) -> Ratio:
+    mantissa, exponent = k._mantissa_and_exponent()
+    if exponent >= 0:
+        return mantissa * k.base**exponent, 1
+    else:
+        return mantissa, k.base**(-exponent)
+
+
+def _string_to_ratio(k: str, base: int) -> Ratio:
+    number = _decimal_number_from_string(k.strip(), base, require_point=False)
+    return _decimal_number_to_ratio(number)
+
+
+def _scaled_square_root(num_digits: int, k: Ratio, base: int) -> int:
+    """
+    Return floor(sqrt(k) * base**(num_digits-1)),
+    using the fastest exact engine for this amount of digits.
+    """
+    if num_digits > NEWTON_THRESHOLD:
+        return _newton_square_root(num_digits, k, base)
+    else:
+        return _exact_square_root(num_digits, k, base)
+
+
+def _exact_square_root(num_digits: int, k: Ratio, base: int) -> int:
+    """
+    Return floor(sqrt(k) * base**(num_digits-1)),
+    i.e. the first [num_digits] digits of sqrt(k) as a single integer.
+    """
+    state = SquareRootState._from_ratio(k, base)
+    state.advance(num_digits)
+    return state.root
+
+
+def _newton_square_root(num_digits: int, k: Ratio, base: int) -> int:
+    """
+    Same as _exact_square_root(), but computes all digits at once
+    using Newton's method. Its cost is a small multiple of the cost
+    of multiplying two num_digits-digit numbers.
+    """
+    numerator, denominator = k
+    scaled_k = _floor_divide(numerator * base**(2*(num_digits - 1)),
+                             denominator)
+    return _isqrt(scaled_k)
+
+
+def _isqrt(n: int) -> int:
+    """
+    Return floor(sqrt(n)) for a nonnegative int n.
+
+    Uses Newton's iteration for the inverse square root,
+    which doubles the precision in every step and only needs
+    multiplications (no divisions), followed by an exact correction.
+    """
+    if n.bit_length() < _ISQRT_THRESHOLD:
+        return math.isqrt(n)
+    # Write n = a * 2**shift with a in [1, 4).
+    shift = (n.bit_length() - 1) & ~1
+    precision = shift // 2 + 32
+    inverse_root = _inverse_sqrt(n, shift, precision)
+    # sqrt(n) = n / sqrt(n); only the leading bits of n are needed.
+    drop = max(shift - precision, 0) & ~1
+    root = ((n >> drop) * inverse_root) >> (precision + shift//2 - drop)
+    while root * root > n:
+        root -= 1
+    while (root + 1) * (root + 1) <= n:
+        root += 1
+    return root
+
+
+def _inverse_sqrt(a: int, fraction_bits: int, precision: int) -> int:
+    """
+    Return approximately 2**precision / sqrt(a / 2**fraction_bits),
+    where 1 ≤ a / 2**fraction_bits < 4.
+
+    Computes the result with half the precision recursively,
+    and then performs one Newton step
+        y = y + y*(1 - a*y**2)/2.
+    """
+    if precision <= 48:
+        leading = a >> (fraction_bits - 52)
+        return int(2.0**precision / math.sqrt(leading / 2.0**52))
+    half = precision//2 + 16
+    y = _inverse_sqrt(a, fraction_bits, half) << (precision - half)
+    a = a >> (fraction_bits - precision)
+    error = (1 << (3*precision)) - a * (y * y)
+    return y + ((y * error) >> (3*precision + 1))
+
+
+def iter_square_root_digits(k: Number, base: int = 10) -> Iterator[int]:
+    """
+    Yield the digits of sqrt(k) one at a time, without end.
+
+    The first value yielded is the integer part of sqrt(k)
+    (which is a single digit only if k < base**2),
+    all following values are the decimals of sqrt(k).
+
+    Use SquareRootState.iter_digits() instead
+    to be able to pause and continue the computation later.
+    """
+    return SquareRootState(k, base).iter_digits()
+
+
+class SquareRootState:
+    """
+    State of the digit-by-digit computation of sqrt(k).
+
+    This is the classic long-division square root:
+    the input is consumed in 'pairs' of digits (chunks of size base**2),
+    and after every step the invariant
+        remainder = scaled_k - root**2
+    holds, where scaled_k = floor(k * base**(2*i)) after i decimals.
+    Appending a digit d to the root gives by binomial expansion
+        (base*root + d)**2 = base**2 * root**2 + d*(2*base*root + d),
+    so the remainder can be updated without ever squaring the root.
+
+    Attributes:
+    * base: base in which the digits are computed.
+    * root: floor(sqrt(k) * base**(position-1)),
+        i.e. all digits computed so far as a single integer.
+    * remainder: floor(k * base**(2*(position-1))) - root**2.
+    * position: amount of digits computed so far
+        (the integer part counts as one digit).
+    * denominator: denominator of k.
+    * pair_remainder: numerator of the part of k
+        that has not yet been consumed, over the denominator.
+    """
+
+    def __init__(self, k: Number, base: int = 10):
+        """
+        Arguments:
+        * k: nonnegative number whose square root is to be computed,
+            see to_ratio() for the accepted types.
+        * base: base of the digits to compute, 2 ≤ base ≤ 34.
+        """
+        numerator, denominator = _check_arguments(1, k, base)
+        self.base = base
+        self.denominator = denominator
+        self.pair_remainder = numerator
+        self.root = 0
+        self.remainder = 0
+        self.position = 0
+
+    @staticmethod
+    def _from_ratio(k: Ratio, base: int) -> SquareRootState:
+        """
+        Construct a SquareRootState from k as returned by _check_arguments(),
+        without converting k again.
+        """
+        state = SquareRootState(0, base)
+        state.pair_remainder, state.denominator = k
+        return state
+
+    def advance(self, num_digits: int):
+        """
+        Compute the next [num_digits] digits.
+        More than NEWTON_THRESHOLD digits are computed at once
+        with Newton's method instead of one at a time.
+        """
+        if num_digits <= 0:
+            return
+        new_position = self.position + num_digits
+        base = self.base
+        square_base = base*base
+        denominator = self.denominator
+        root = self.root
+        remainder = self.remainder
+        pair_remainder = self.pair_remainder
+
+        if self.position == 0:
+            # Integer part: floor(sqrt(k)) == isqrt(floor(k)).
+            scaled_k, pair_remainder = divmod(pair_remainder, denominator)
+            root = math.isqrt(scaled_k)
+            remainder = scaled_k - root*root
+            num_digits -= 1
+
+        if num_digits > NEWTON_THRESHOLD:
+            # Jump ahead: all new pairs of digits of k at once,
+            # and the new root with Newton's method.
+            scale = square_base**num_digits
+            pair, pair_remainder = divmod(pair_remainder*scale, denominator)
+            scaled_k = (root*root + remainder)*scale + pair
+            root = _isqrt(scaled_k)
+            remainder = scaled_k - root*root
+            num_digits = 0
+
+        for _ in range(num_digits):
+            # Next 'pair' of digits of k.
+            pair, pair_remainder = divmod(pair_remainder*square_base,
+                                          denominator)
+            remainder = remainder*square_base + pair
+            twice_root = 2*base*root
+            digit = _select_digit(remainder, twice_root, base)
+            remainder -= digit * (twice_root + digit)
+            root = root*base + digit
+
+        self.root = root
+        self.remainder = remainder
+        self.pair_remainder = pair_remainder
+        self.position = new_position
+
+    def next_digit(self) -> int:
+        """
+        Compute and return the next digit.
+        The first digit is the whole integer part of sqrt(k).
+        """
+        self.advance(1)
+        if self.position == 1:
+            return self.root
+        else:
+            return self.root % self.base
+
+    def iter_digits(self) -> Iterator[int]:
+        """
+        Yield the next digits without end.
+        This state object is updated after every yielded digit,
+        so after stopping the iteration it can be continued
+        by calling iter_digits() again.
+        """
+        while True:
+            yield self.next_digit()
+
+
+def _select_digit(remainder: int, twice_root: int, base: int) -> int:
+    """
+    Return the greatest digit d < base with d*(twice_root + d) ≤ remainder.
+
+    The digit is estimated from remainder // twice_root,
+    which can only overshoot by d**2/twice_root,
+    and the estimate is corrected by bisection.
+    For long roots the bisection takes at most one step.
+    """
+    if twice_root == 0:
+        low, high = 0, base - 1
+    else:
+        high = min(remainder // twice_root, base - 1)
+        low = min(remainder // (twice_root + base), high)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if middle * (twice_root + middle) <= remainder:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _float_square_root(num_digits: int, k: float, base: int) -> List[int]:
+    """
+    Return the first [num_digits] digits of sqrt(k), using floats.
+    Only reliable up to machine precision.
+    """
     # Invariant: sum_{i=0}^{num_digits} d[i]*(10^-i) = cumsum
     cumsum = 0
     d = [0]*num_digits
     for i in range(0, num_digits):
-        while ((cumsum + (d[i] + 1)* (base**(-i)))**2 <= k) and (d[i] < base-1):
-            d[i] += 1
-        cumsum += d[i] * (base**(-i))
-    return f"{d[0]}." + "".join((str(x) for x in d[1:]))
+        step = base**(-i)
+        # Bisection for the greatest d[i] with (cumsum + d[i]*step)**2 <= k.
+        low, high = 0, base - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if (cumsum + middle*step)**2 <= k:
+                low = middle
+            else:
+                high = middle - 1
+        d[i] = low
+        cumsum += d[i] * step
+    return d
+
+
+def _format_root(root: int, num_digits: int, base: int) -> str:
+    """
+    Format floor(sqrt(k) * base**(num_digits-1)) as the string
+    representation of sqrt(k) with num_digits-1 decimals.
+    """
+    # Pad with zeros up to (and including) the first integer digit.
+    digits = int_to_digits(root, base, num_digits)
+    split = len(digits) - (num_digits - 1)
+    integer_part = "".join(DIGIT_TO_STRING[x] for x in digits[:split])
+    decimal_part = "".join(DIGIT_TO_STRING[x] for x in digits[split:])
+    return integer_part + "." + decimal_part
+
 
+def _format_digits(d: List[int]) -> str:
+    """
+    Format a list of digits, the first being the integer part.
+    """
+    integer_part = DIGIT_TO_STRING[d[0]]
+    return integer_part + "." + "".join(DIGIT_TO_STRING[x] for x in d[1:])
@@ -15,10 +15,60 @@ You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 from __future__ import annotations
-import re
-from typing import Any, Iterator, Tuple
+from typing import (Any, Dict, Iterable, Iterator, List, Optional, Sequence,
+                    Tuple)
 import math
-from square_roots.digit_to_string import DIGIT_TO_STRING, STRING_TO_DIGIT
+import mmap
+import struct
+from square_roots.digit_to_string import (DIGIT_TO_STRING_TABLE,
+                                          INVALID_DIGIT,
+                                          STRING_TO_DIGIT,
+                                          STRING_TO_DIGIT_TABLE)
+from square_roots.radix import _floor_divide, digits_to_int, int_to_digits
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Multiplication algorithm thresholds, in digits. Operands with at most
+# SCHOOLBOOK_THRESHOLD digits are multiplied digit by digit.
+# Operands with at least FFT_THRESHOLD digits are multiplied with a
+# NumPy FFT convolution (if NumPy is available).
+# Other operands are converted to Python ints, whose multiplication
+# uses Karatsuba's algorithm for large values.
+SCHOOLBOOK_THRESHOLD = 40
+FFT_THRESHOLD = 20000
+
+# Amount of decimals computed by the / operator, see DecimalNumber.divide().
+DIVISION_DECIMALS = 50
+
+# Amount of digits compared at once by DecimalNumber._compare_magnitude().
+_COMPARE_WINDOW = 1024
+
+# Amount of digits read or written at once by DecimalNumber.from_file()
+# and DecimalNumber.to_file().
+FILE_CHUNK_SIZE = 1 << 20
+
+# From this many digits, addition and subtraction of digit arrays
+# are vectorized with NumPy (if NumPy is available).
+VECTORIZE_THRESHOLD = 2000
+
+# Binary format of DecimalNumber.to_bytes(): a header with
+# the magic bytes b"DNUM", the base, 1 if the number is negative (else 0),
+# the amount of bits per digit, a zero byte, the exponent
+# (position of the least significant digit) as a signed 64-bit int
+# and the amount of digits as an unsigned 64-bit int, all little-endian.
+# The digits follow, most significant first.
+# Digits take ceil(log2(base)) bits (the width). Every 8 digits
+# form a big-endian group of [width] bytes, first digit in the highest bits,
+# so the groups start at fixed offsets (see _pack_digits()).
+_PACKED_MAGIC = b"DNUM"
+_PACKED_HEADER = struct.Struct("<4sBBBxqQ")
+
+# DecimalNumber.base_power(base, exponent) returns the same instance
+# for every call with |exponent| at most this.
+INTERNED_EXPONENTS = 64
 
 
 class DecimalNumber:
@@ -28,6 +78,9 @@ class DecimalNumber:
     and longs. 
     However, DecimalNumber is completely free from rounding errors.
     """
+    __slots__ = ("__base", "__is_positive", "__digits", "__exponent",
+                 "__mantissa", "__int_backend", "__frozen", "__hash",
+                 "__digits_shared")
 
     def __init__(self, base: int, sign: bool | int = 1):
         """
@@ -40,12 +93,29 @@ class DecimalNumber:
             negative ints and False set the sign to negative.
         """
         self.__base = base
+        # See freeze().
+        self.__frozen = False
+        self.__hash = None
         self.set_sign(sign)
-        # Dictionary mapping indices to digit values.
+        # Digit values, one byte per digit, least significant digit first.
+        # self.__digits[i] is the digit at position self.__exponent + i.
         # Conventions:
-        # * Index 0 is the first integer digit, and -1 the first decimal digit.
-        # * Digits with value 0 are not explicitly stored in self.__digits.
-        self.__digits = dict()
+        # * Position 0 is the first integer digit,
+        #   and -1 the first decimal digit.
+        # * There are no zeros at either end of self.__digits,
+        #   so the number 0 has no digits at all.
+        # self.__digits is None if the digits have not been materialized
+        # from self.__mantissa yet.
+        self.__digits = bytearray()
+        # True if self.__digits is also used by another DecimalNumber
+        # (see shifted()) or viewed by an array of digits_view(),
+        # so it must be copied before it is modified.
+        self.__digits_shared = False
+        self.__exponent = 0
+        # Magnitude of the number is self.__mantissa * base**self.__exponent,
+        # or None if not computed yet. See enable_int_backend().
+        self.__mantissa = None
+        self.__int_backend = False
 
     @property
     def sign(self) -> int:
@@ -70,6 +140,7 @@ class DecimalNumber:
             For a nonnegative int or the bool True,
             the sign is set to positive.
         """
+        self.__raise_error_if_frozen()
         if type(sign) is int:
             self.__is_positive = sign >= 0
         elif type(sign) is bool:
@@ -80,12 +151,197 @@ class DecimalNumber:
     def copy(self) -> DecimalNumber:
         """
         Create a new DecimalNumber instance identical to self.
+        The copy is not frozen.
         """
         result = DecimalNumber(self.base, self.sign)
-        for pos, digit_value in self:
-            result[pos] = digit_value
+        if self.__digits is not None:
+            result.__digits = self.__digits[:]
+        else:
+            result.__digits = None
+        result.__exponent = self.__exponent
+        result.__mantissa = self.__mantissa
+        result.__int_backend = self.__int_backend
+        return result
+
+    def freeze(self) -> DecimalNumber:
+        """
+        Return a frozen DecimalNumber equal to self:
+        it cannot be modified, and it is hashable,
+        so it can be used in sets and as a dict key.
+        The hash is computed once, from the trimmed digits.
+
+        Returns self if self is already frozen,
+        the interned instance if self is 0 or a power of the base
+        (see DecimalNumber.base_power()),
+        and otherwise a frozen copy that shares the digits of self.
+        """
+        if self.__frozen:
+            return self
+        if self.__is_zero():
+            return DecimalNumber.zero(self.base)
+        exponent = self.__interned_power_exponent()
+        if exponent is not None:
+            return DecimalNumber.base_power(self.base, exponent)
+        result = self.shifted(0)
+        result.__frozen = True
+        return result
+
+    def __interned_power_exponent(self) -> Optional[int]:
+        """
+        Return e if self (nonzero) equals base**e
+        with |e| <= INTERNED_EXPONENTS, and None otherwise.
+        The digits are not materialised.
+        """
+        if not self.__is_positive:
+            return None
+        if self.__digits is not None:
+            if (self.__digits == b"\x01"
+                    and abs(self.__exponent) <= INTERNED_EXPONENTS):
+                return self.__exponent
+            return None
+        if abs(self.__estimate_top_position()) > INTERNED_EXPONENTS + 2:
+            return None
+        top = self.__top_position()
+        if (abs(top) <= INTERNED_EXPONENTS
+                and self.__mantissa == self.base**(top - self.__exponent)):
+            return top
+        return None
+
+    def is_frozen(self) -> bool:
+        return self.__frozen
+
+    def __hash__(self) -> int:
+        if not self.__frozen:
+            raise TypeError("Unhashable DecimalNumber: "
+                            "use DecimalNumber.freeze() to hash it.")
+        if self.__hash is None:
+            digits = self.__get_digits()
+            sign = self.sign if len(digits) > 0 else 0
+            self.__hash = hash((self.base, sign, self.__exponent,
+                                bytes(digits)))
+        return self.__hash
+
+    def __raise_error_if_frozen(self):
+        if self.__frozen:
+            raise TypeError("A frozen DecimalNumber cannot be modified.")
+
+    @staticmethod
+    def zero(base: int) -> DecimalNumber:
+        """
+        Return the frozen number 0 in the given base.
+        Every call with the same base returns the same instance.
+        """
+        result = _INTERNED.get((base, None))
+        if result is None:
+            result = DecimalNumber(base)
+            result.__frozen = True
+            _INTERNED[(base, None)] = result
+        return result
+
+    @staticmethod
+    def base_power(base: int, exponent: int = 0) -> DecimalNumber:
+        """
+        Return the frozen number base**exponent,
+        which is 1 for the default exponent 0.
+        Every call with the same arguments returns the same instance,
+        if |exponent| <= INTERNED_EXPONENTS.
+        """
+        result = _INTERNED.get((base, exponent))
+        if result is None:
+            result = DecimalNumber._from_digits(base, 1, b"\x01", exponent)
+            result.__frozen = True
+            if abs(exponent) <= INTERNED_EXPONENTS:
+                _INTERNED[(base, exponent)] = result
+        return result
+
+    def enable_int_backend(self):
+        """
+        Keep the value of this number as a Python int (the mantissa)
+        times self.base**exponent, besides its digits.
+
+        Addition and comparisons involving a number with the int backend
+        use CPython's big-int arithmetic instead of per-digit loops.
+        Their results also use the int backend,
+        and their digits are only computed when they are indexed,
+        iterated or printed.
+        """
+        self.__raise_error_if_frozen()
+        self.__get_mantissa()
+        self.__int_backend = True
+
+    def uses_int_backend(self) -> bool:
+        return self.__int_backend
+
+    def __get_digits(self) -> bytearray:
+        """
+        Return self.__digits, materializing them from the mantissa if needed.
+        """
+        if self.__digits is None:
+            self.__digits = bytearray(
+                reversed(int_to_digits(self.__mantissa, self.base)))
+            old_exponent = self.__exponent
+            self.__trim()
+            # Keep the mantissa consistent with the trimmed digits.
+            if self.__exponent > old_exponent:
+                self.__mantissa //= self.base**(self.__exponent - old_exponent)
+            elif self.__exponent < old_exponent:
+                # Only 0 gets a lower exponent, see __trim().
+                self.__mantissa = 0
+        return self.__digits
+
+    def __get_writable_digits(self) -> bytearray:
+        """
+        Same as __get_digits(), but first copy the digits
+        if they are shared with another DecimalNumber
+        or with an array of digits_view().
+        """
+        digits = self.__get_digits()
+        if not isinstance(digits, bytearray) or self.__digits_shared:
+            digits = self.__digits = bytearray(digits)
+            self.__digits_shared = False
+        return digits
+
+    def __get_mantissa(self) -> int:
+        """
+        Return self.__mantissa, computing it from the digits if needed.
+        """
+        if self.__mantissa is None:
+            self.__mantissa = digits_to_int(self.__digits[::-1], self.base)
+        return self.__mantissa
+
+    def __aligned_mantissas(self, other: DecimalNumber) -> Tuple[int, int, int]:
+        """
+        Return (m_1, m_2, exponent) such that self == m_1 * base**exponent
+        and other == m_2 * base**exponent, signs included.
+        """
+        exponent = min(self.__exponent, other.__exponent)
+        m_1 = self.sign * self.__get_mantissa() \
+            * self.base**(self.__exponent - exponent)
+        m_2 = other.sign * other.__get_mantissa() \
+            * self.base**(other.__exponent - exponent)
+        return m_1, m_2, exponent
+
+    @staticmethod
+    def _from_mantissa(base: int, value: int, exponent: int) -> DecimalNumber:
+        """
+        Construct a DecimalNumber with the int backend
+        whose value is value * base**exponent.
+        """
+        result = DecimalNumber(base, value >= 0)
+        result.__digits = None
+        result.__mantissa = abs(value)
+        result.__exponent = exponent
+        result.__int_backend = True
         return result
 
+    def _mantissa_and_exponent(self) -> Tuple[int, int]:
+        """
+        Return (value, exponent) such that self == value * base**exponent,
+        sign included. The mantissa is converted from the digits at once,
+        so this is subquadratic in the amount of digits.
+        """
+        return self.sign * self.__get_mantissa(), self.__exponent
+
     def __iter__(self) -> Iterator[Tuple[int, int]]:
         """
         Return all (position, digit-value) pairs of this DecimalNumber.
@@ -93,15 +349,20 @@ class DecimalNumber:
         The greatest position is that of the most significant digit,
         and the least position is that of the least significant digit.
         Do not return any pair where the digit value is 0.
+
+        The pairs are those of the digits at the time of the call,
+        so self may be modified while iterating.
         """
-        pairs = tuple((pos, digit_value) for pos, digit_value
-                      in sorted(self.__digits.items(), key=lambda x: x[0],
-                                reverse=True))
-        return iter(pairs)
+        return _iter_nonzero_digits(bytes(self.__get_digits()),
+                                    self.__exponent)
 
     def __add__(self, other: DecimalNumber | int) -> DecimalNumber:
         if isinstance(other, int):
             other = DecimalNumber.from_int(other, self.base)
+        if (isinstance(other, DecimalNumber) and other.base == self.base
+                and (self.__int_backend or other.__int_backend)):
+            m_1, m_2, exponent = self.__aligned_mantissas(other)
+            return DecimalNumber._from_mantissa(self.base, m_1 + m_2, exponent)
         return add_decimal_numbers(self, other)
 
     def _add_to_digit(self, pos: int, value: int):
@@ -111,42 +372,35 @@ class DecimalNumber:
         [value] may exceed self.base,
         and self[pos]+value may also exceed self.base:
         in either case, self[pos] is trimmed in the range [0, self.base)
-        and the remaining carry digits are recursively 
-        added to higher positions.
+        and the remaining carry digits are added to higher positions.
         """
         assert value >= 0
 
-        if value > 0:
-            carry_digits = (self[pos] + value)//self.base
-            self[pos] = (self[pos] + value) % self.base
-            if carry_digits > 0:
-                self._add_to_digit(pos+1, carry_digits)
+        while value > 0:
+            value, self[pos] = divmod(self[pos] + value, self.base)
+            pos += 1
 
     def _subtract_from_digit(self, pos: int, value: int):
         """
         Subtract [value] amount from digit at position [pos].
-        If [value] > self[pos], recursively subtract borrows from higher
-        positions.
+        If [value] > self[pos], subtract borrows from higher positions.
         Raise an error if need to borrow and pos is the most significant digit.
         """
         assert value >= 0
 
-        if pos >= self.get_most_significant_pos() and value > self[pos]:
-            raise RuntimeError("Cannot subtract from position: "
-                               "unable to borrow sufficient "
-                               "from higher positions.")
-
-        if value > self[pos]:
-            # First pay as much dept as we can.
+        while value > self[pos]:
+            if pos >= self.get_most_significant_pos():
+                raise RuntimeError("Cannot subtract from position: "
+                                   "unable to borrow sufficient "
+                                   "from higher positions.")
+            # First pay as much dept as we can,
+            # and borrow the remaining dept from higher positions.
             value -= self[pos]
-            self[pos] = 0
-            # Borrow remaining dept from higher positions.
-            borrows = math.ceil(value/self.base)
+            borrows = -(-value // self.base)
             self[pos] = borrows * self.base - value
-            self._subtract_from_digit(pos+1, borrows)
-
-        else:
-            self[pos] -= value
+            pos += 1
+            value = borrows
+        self[pos] -= value
 
     def get_most_significant_pos(self) -> int:
         """
@@ -156,10 +410,10 @@ class DecimalNumber:
 
         Return 0 if this number is (plus or minus) 0 (without any other digit).
         """
-        if len(self.__digits.keys()) == 0:
+        if len(self.__get_digits()) == 0:
             return 0
         else:
-            return max(self.__digits.keys())
+            return self.__exponent + len(self.__get_digits()) - 1
 
     def get_lest_significant_pos(self) -> int:
         """
@@ -169,22 +423,350 @@ class DecimalNumber:
 
         Return 0 if this number is (plus or minus) 0 (without any other digit).
         """
-        if len(self.__digits.keys()) == 0:
+        if len(self.__get_digits()) == 0:
             return 0
         else:
-            return min(self.__digits.keys())
+            return self.__exponent
 
     def get_most_significant_digit(self) -> int:
         return self[self.get_most_significant_pos()]
 
-    def __sub__(self, other: DecimalNumber | int):
-        raise NotImplementedError()
+    def digits_view(self) -> np.ndarray:
+        """
+        Return the digits of self as a read-only NumPy array of uint8,
+        most significant digit first, without copying them.
+        The last digit is at position self.get_lest_significant_pos(),
+        and the number 0 has no digits.
+
+        The array keeps showing the current digits if self is modified
+        later, because self then copies its digits before modifying them.
+        Requires NumPy.
+        """
+        if np is None:
+            raise ImportError("DecimalNumber.digits_view() requires NumPy.")
+        digits = self.__get_digits()
+        self.__digits_shared = True
+        view = np.frombuffer(digits, dtype=np.uint8)[::-1]
+        view.flags.writeable = False
+        return view
+
+    def __sub__(self, other: DecimalNumber | int) -> DecimalNumber:
+        if isinstance(other, int):
+            other = DecimalNumber.from_int(other, self.base)
+        if (isinstance(other, DecimalNumber) and other.base == self.base
+                and (self.__int_backend or other.__int_backend)):
+            m_1, m_2, exponent = self.__aligned_mantissas(other)
+            return DecimalNumber._from_mantissa(self.base, m_1 - m_2, exponent)
+        return subtract_decimal_numbers(self, other)
+
+    def __iadd__(self, other: DecimalNumber | int) -> DecimalNumber:
+        """
+        Add other to self in place, reusing the digit storage of self.
+        For a frozen self, a += b binds a to the new number a + b.
+        """
+        if self.__frozen:
+            return NotImplemented
+        return self.__add_in_place(other, 1)
+
+    def __isub__(self, other: DecimalNumber | int) -> DecimalNumber:
+        """
+        Subtract other from self in place,
+        reusing the digit storage of self.
+        """
+        if self.__frozen:
+            return NotImplemented
+        return self.__add_in_place(other, -1)
+
+    def __imul__(self, other: DecimalNumber | int) -> DecimalNumber:
+        """
+        Multiply self by other in place.
+        The product is computed as by __mul__(),
+        and self takes over its storage.
+        """
+        if self.__frozen:
+            return NotImplemented
+        self.__take_storage(self * other)
+        return self
+
+    def __add_in_place(self, other: DecimalNumber | int,
+                       sign: int) -> DecimalNumber:
+        """
+        Set self to self + sign*other, and return self.
+        """
+        if isinstance(other, int):
+            other = DecimalNumber.from_int(other, self.base)
+        self.__raise_error_if_incompatible_num(other)
+        if self.__int_backend or other.__int_backend:
+            m_1, m_2, exponent = self.__aligned_mantissas(other)
+            self.__take_storage(DecimalNumber._from_mantissa(
+                self.base, m_1 + sign*m_2, exponent))
+            return self
+        if other is self:
+            other = other.copy()
+        sign_2 = sign * other.sign
+        if len(other.__get_digits()) >= VECTORIZE_THRESHOLD:
+            # The vectorized algorithms create a new array anyway.
+            if sign_2 == other.sign:
+                self.__take_storage(add_decimal_numbers(self, other))
+            else:
+                self.__take_storage(subtract_decimal_numbers(self, other))
+        elif self.sign == sign_2 or len(self.__get_digits()) == 0:
+            self.set_sign(sign_2 if len(self.__get_digits()) == 0
+                          else self.sign)
+            self.__add_magnitude_in_place(other)
+        elif self._compare_magnitude(other) >= 0:
+            self.__subtract_magnitude_in_place(other)
+        else:
+            self.__take_storage(
+                DecimalNumber._subtract_magnitudes(other, self, sign_2))
+        return self
+
+    def __add_magnitude_in_place(self, other: DecimalNumber):
+        """
+        Set |self| to |self| + |other|.
+        """
+        digits = self.__get_writable_digits()
+        digits_2 = other.__get_digits()
+        if len(digits_2) == 0:
+            return
+        if len(digits) == 0:
+            digits += digits_2
+            self.__exponent = other.__exponent
+            self.__mantissa = None
+            return
+        if other.__exponent < self.__exponent:
+            digits[0:0] = bytes(self.__exponent - other.__exponent)
+            self.__exponent = other.__exponent
+        high = other.get_most_significant_pos()
+        if high > self.get_most_significant_pos():
+            digits.extend(bytes(high - self.get_most_significant_pos()))
+        _add_digits(digits, digits_2, other.__exponent - self.__exponent,
+                    self.base)
+        self.__mantissa = None
+        self.__trim()
+
+    def __subtract_magnitude_in_place(self, other: DecimalNumber):
+        """
+        Set |self| to |self| - |other|. Requires |self| >= |other|.
+        """
+        digits = self.__get_writable_digits()
+        digits_2 = other.__get_digits()
+        if len(digits_2) == 0:
+            return
+        if other.__exponent < self.__exponent:
+            digits[0:0] = bytes(self.__exponent - other.__exponent)
+            self.__exponent = other.__exponent
+        _subtract_digits(digits, digits_2,
+                         other.__exponent - self.__exponent, self.base)
+        self.__mantissa = None
+        self.__trim()
+
+    def __take_storage(self, other: DecimalNumber):
+        """
+        Make self equal to other, sharing (not copying) its storage.
+        other must not be used anymore afterwards.
+        """
+        self.__is_positive = other.__is_positive
+        self.__digits = other.__digits
+        self.__exponent = other.__exponent
+        self.__mantissa = other.__mantissa
+        self.__int_backend = other.__int_backend
+        self.__digits_shared = other.__digits_shared
+
+    def _compare_magnitude(self, other: DecimalNumber) -> int:
+        """
+        Return 1, 0 or -1 if the absolute value of self is
+        greater than, equal to or less than that of other.
+        Compares from the most significant digit downwards,
+        and stops at the first difference.
+        """
+        digits_1 = self.__get_digits()
+        digits_2 = other.__get_digits()
+        if len(digits_1) == 0 or len(digits_2) == 0:
+            return (len(digits_1) > 0) - (len(digits_2) > 0)
+        top_1 = self.get_most_significant_pos()
+        top_2 = other.get_most_significant_pos()
+        if top_1 != top_2:
+            return 1 if top_1 > top_2 else -1
+        if self.__exponent == other.__exponent and digits_1 == digits_2:
+            return 0
+        # Both arrays end at the same position:
+        # compare equally long windows from their ends downwards.
+        end_1 = len(digits_1)
+        end_2 = len(digits_2)
+        while end_1 > 0 and end_2 > 0:
+            size = min(_COMPARE_WINDOW, end_1, end_2)
+            window_1 = digits_1[end_1 - size:end_1]
+            window_2 = digits_2[end_2 - size:end_2]
+            if window_1 != window_2:
+                for i in range(size - 1, -1, -1):
+                    if window_1[i] != window_2[i]:
+                        return 1 if window_1[i] > window_2[i] else -1
+            end_1 -= size
+            end_2 -= size
+        # Equal up to here: the longer one has more nonzero digits.
+        return (end_1 > 0) - (end_2 > 0)
+
+    @staticmethod
+    def _add_magnitudes(num_1: DecimalNumber, num_2: DecimalNumber,
+                        sign: int) -> DecimalNumber:
+        """
+        Return a new DecimalNumber with absolute value |num_1| + |num_2|
+        and the given sign, in a single low-to-high pass
+        with a running carry.
+        """
+        base = num_1.base
+        if len(num_1.__get_digits()) < len(num_2.__get_digits()):
+            num_1, num_2 = num_2, num_1
+        digits_1 = num_1.__get_digits()
+        digits_2 = num_2.__get_digits()
+        low = min(num_1.__exponent, num_2.__exponent)
+        high = max(num_1.get_most_significant_pos(),
+                   num_2.get_most_significant_pos())
+        if np is not None and len(digits_2) >= VECTORIZE_THRESHOLD:
+            values = np.zeros(high - low + 1, dtype=np.int16)
+            _add_at(values, digits_1, num_1.__exponent - low)
+            _add_at(values, digits_2, num_2.__exponent - low)
+            carry_in = _chain_inputs(values >= base, values == base - 1)
+            result = ((values + carry_in[:-1]) % base).astype(np.uint8)
+            result = result.tobytes() + bytes([int(carry_in[-1])])
+            return DecimalNumber._from_digits(base, sign, result, low)
+        if len(digits_2) == 0:
+            result = bytearray(digits_1)
+        else:
+            result = (bytearray(num_1.__exponent - low) + digits_1
+                      + bytearray(high - num_1.get_most_significant_pos()))
+        _add_digits(result, digits_2, num_2.__exponent - low, base)
+        return DecimalNumber._from_digits(base, sign, result,
+                                          low if len(digits_2) > 0
+                                          else num_1.__exponent)
+
+    @staticmethod
+    def _subtract_magnitudes(bigger: DecimalNumber, smaller: DecimalNumber,
+                             sign: int) -> DecimalNumber:
+        """
+        Return a new DecimalNumber with absolute value |bigger| - |smaller|
+        and the given sign, in a single pass with a running borrow.
+        Requires |bigger| >= |smaller|.
+        """
+        base = bigger.base
+        digits_big = bigger.__get_digits()
+        digits_small = smaller.__get_digits()
+        low = min(bigger.__exponent, smaller.__exponent)
+        if (np is not None
+                and min(len(digits_big), len(digits_small))
+                >= VECTORIZE_THRESHOLD):
+            values = np.zeros(len(digits_big) + bigger.__exponent - low,
+                              dtype=np.int16)
+            _add_at(values, digits_big, bigger.__exponent - low)
+            _add_at(values, digits_small, smaller.__exponent - low, -1)
+            borrow_in = _chain_inputs(values < 0, values == 0)
+            result = ((values - borrow_in[:-1]) % base).astype(np.uint8)
+            return DecimalNumber._from_digits(base, sign, result.tobytes(),
+                                              low)
+        result = bytearray(bigger.__exponent - low) + digits_big
+        _subtract_digits(result, digits_small, smaller.__exponent - low, base)
+        return DecimalNumber._from_digits(base, sign, result, low)
+
+    def __mul__(self, other: DecimalNumber | int) -> DecimalNumber:
+        """
+        Return the exact product of self and other.
+        The algorithm is chosen by the size of the operands,
+        see SCHOOLBOOK_THRESHOLD and FFT_THRESHOLD.
+        """
+        if isinstance(other, int):
+            other = DecimalNumber.from_int(other, self.base)
+        self.__raise_error_if_incompatible_num(other)
+        sign = self.sign * other.sign
+        exponent = self.__exponent + other.__exponent
+        if not (self.__int_backend or other.__int_backend):
+            digits_1 = self.__get_digits()
+            digits_2 = other.__get_digits()
+            if max(len(digits_1), len(digits_2)) <= SCHOOLBOOK_THRESHOLD:
+                product = _schoolbook_multiply(digits_1, digits_2, self.base)
+                return DecimalNumber._from_digits(self.base, sign, product,
+                                                  exponent)
+            if (np is not None
+                    and min(len(digits_1), len(digits_2)) >= FFT_THRESHOLD):
+                product = _fft_multiply(digits_1, digits_2, self.base)
+                if product is not None:
+                    return DecimalNumber._from_digits(self.base, sign,
+                                                      product, exponent)
+        product = self.__get_mantissa() * other.__get_mantissa()
+        return DecimalNumber._from_mantissa(self.base, sign * product,
+                                            exponent)
+
+    def __rmul__(self, other: int) -> DecimalNumber:
+        return self * other
+
+    def __truediv__(self, other: DecimalNumber | int) -> DecimalNumber:
+        """
+        Same as self.divide(other, DIVISION_DECIMALS).
+        """
+        return self.divide(other, DIVISION_DECIMALS)
+
+    def divide(self, other: DecimalNumber | int,
+               num_decimals: int) -> DecimalNumber:
+        """
+        Return self / other, truncated (towards zero)
+        to [num_decimals] digits after the floating point.
 
-    def __mul__(self, other: DecimalNumber | int):
-        raise NotImplementedError()
+        For large operands, the quotient is computed with
+        a Newton iteration for the reciprocal of other,
+        which costs a small multiple of one multiplication.
+        """
+        if isinstance(other, int):
+            other = DecimalNumber.from_int(other, self.base)
+        self.__raise_error_if_incompatible_num(other)
+        divisor = other.__get_mantissa()
+        if divisor == 0:
+            raise ZeroDivisionError("DecimalNumber division by zero.")
+        # self / other * base**num_decimals
+        #   = mantissa * base**shift / divisor
+        shift = self.__exponent - other.__exponent + num_decimals
+        if shift >= 0:
+            dividend = self.__get_mantissa() * self.base**shift
+        else:
+            dividend = self.__get_mantissa() // self.base**(-shift)
+        quotient = _floor_divide(dividend, divisor)
+        return DecimalNumber._from_mantissa(
+            self.base, self.sign * other.sign * quotient, -num_decimals)
 
-    def __truediv__(self, other: DecimalNumber | int):
-        raise NotImplementedError()
+    def to_base(self, new_base: int, precision: int) -> DecimalNumber:
+        """
+        Return this number in the base new_base,
+        truncated (towards zero) to [precision] digits
+        after the floating point.
+
+        The conversion goes through the int mantissa,
+        whose digits in the new base are computed by divide-and-conquer
+        (see radix.int_to_digits()) when they are needed.
+        The result uses the int backend, like the result of divide().
+        """
+        if new_base > 34:
+            raise NotImplementedError("Unly bases up to 34 are supported, "
+                                      "for notational-practical reasons")
+        elif new_base < 2:
+            raise ValueError("Invalid base, must be 2 or greater.")
+        if precision < 0:
+            raise ValueError("Precision must be nonnegative.")
+        mantissa = self.__get_mantissa()
+        if self.__exponent >= 0:
+            value = mantissa * self.base**self.__exponent
+            result = DecimalNumber._from_mantissa(new_base, self.sign * value,
+                                                  0)
+        elif self.base & (self.base - 1) == 0:
+            # Dividing by a power of two is a shift.
+            shift = (self.base.bit_length() - 1) * -self.__exponent
+            value = (mantissa * new_base**precision) >> shift
+            result = DecimalNumber._from_mantissa(new_base, self.sign * value,
+                                                  -precision)
+        else:
+            value = _floor_divide(mantissa * new_base**precision,
+                                  self.base**(-self.__exponent))
+            result = DecimalNumber._from_mantissa(new_base, self.sign * value,
+                                                  -precision)
+        return result
 
     def __raise_error_if_incompatible_num(self, other: Any):
         """
@@ -200,20 +782,116 @@ class DecimalNumber:
                                       "different bases not (yet) supported.")
 
     def shift(self, positions: int):
-        if positions == 0:
-            return
-        old_digits = self.__digits.copy()
-        self.__digits = {old_pos + positions: self.__digits[old_pos]
-                         for old_pos in old_digits.keys()}
+        """
+        Multiply self by self.base**positions, in place.
+        """
+        self.__raise_error_if_frozen()
+        self.__exponent += positions
 
-    def __int__(self) -> int:
-        raise NotImplementedError()
+    def shifted(self, positions: int) -> DecimalNumber:
+        """
+        Return self * self.base**positions as a new DecimalNumber.
+        The result shares the digit storage of self without copying it.
+        Each of the two numbers copies the digits
+        the first time it is modified afterwards.
+        """
+        result = DecimalNumber(self.base, self.sign)
+        result.__digits = self.__digits
+        result.__exponent = self.__exponent + positions
+        result.__mantissa = self.__mantissa
+        result.__int_backend = self.__int_backend
+        if self.__digits is not None:
+            self.__digits_shared = result.__digits_shared = True
+        return result
 
-    def __round__(self, ndigits: int) -> float:
-        raise NotImplementedError()
+    def __int__(self) -> int:
+        """
+        Return the integer part of self (rounded towards zero).
+        Only the integer digits are converted.
+        """
+        if self.__digits is None:
+            if self.__exponent >= 0:
+                value = self.__mantissa * self.base**self.__exponent
+            else:
+                value = self.__mantissa // self.base**(-self.__exponent)
+        else:
+            integer_digits = self.__digits[max(-self.__exponent, 0):]
+            value = digits_to_int(integer_digits[::-1], self.base) \
+                * self.base**max(self.__exponent, 0)
+        return self.sign * value
 
     def __float__(self) -> float:
-        raise NotImplementedError()
+        """
+        Return the float nearest to self (ties to even),
+        as for Python ints and Fractions.
+
+        Only the leading digits are read, unless self is
+        too close to halfway between two floats to decide from them.
+        """
+        digits = self.__digits
+        # Enough leading digits for at least 64 significant bits.
+        leading = 64 // (self.base.bit_length() - 1) + 2
+        if digits is not None and len(digits) > leading:
+            # The value lies strictly between low and low + 1,
+            # times base**exponent.
+            exponent = self.__exponent + len(digits) - leading
+            low = digits_to_int(digits[:-leading - 1:-1], self.base)
+            result = _int_ratio_to_float(low, self.base, exponent)
+            if result == _int_ratio_to_float(low + 1, self.base, exponent):
+                return self.sign * result
+        return self.sign * _int_ratio_to_float(self.__get_mantissa(),
+                                               self.base, self.__exponent)
+
+    def __round__(self, ndigits: int | None = None) -> int | DecimalNumber:
+        """
+        Round self to [ndigits] digits after the floating point,
+        with ties to even, and return the result as a new DecimalNumber.
+        As for other numbers, round(self) returns an int.
+
+        Only the digits up to the first one that decides the rounding
+        are read.
+        """
+        if ndigits is None:
+            return int(round(self, 0))
+        cut = -ndigits
+        if self.__exponent >= cut:
+            return self.copy()
+        if self.__digits is None:
+            scale = self.base**(cut - self.__exponent)
+            value, remainder = divmod(self.__mantissa, scale)
+            comparison = (2*remainder > scale) - (2*remainder < scale)
+            if comparison > 0 or (comparison == 0 and value % 2 == 1):
+                value += 1
+            return DecimalNumber._from_mantissa(self.base, self.sign * value,
+                                                cut)
+        digits = self.__digits
+        index = cut - self.__exponent
+        result = DecimalNumber._from_digits(self.base, self.sign,
+                                            digits[index:], cut)
+        comparison = self.__compare_to_half(index)
+        if comparison > 0 or (comparison == 0 and self[cut] % 2 == 1):
+            result._add_to_digit(cut, 1)
+        return result
+
+    def __compare_to_half(self, index: int) -> int:
+        """
+        Return 1, 0 or -1 if the digits below self.__digits[index]
+        (a fraction of one unit of that digit)
+        are greater than, equal to or less than one half.
+        """
+        digits = self.__digits
+        base = self.base
+        for i in range(index - 1, -1, -1):
+            digit = digits[i] if i < len(digits) else 0
+            if base % 2 == 0:
+                if digit != base // 2:
+                    return 1 if digit > base // 2 else -1
+                # Digits are trimmed, so digits[0] is not 0.
+                return 1 if i > 0 else 0
+            elif digit != base // 2:
+                # In an odd base, one half is 0.(base//2)(base//2)...
+                return 1 if digit > base // 2 else -1
+        return -1
 
     def __setitem__(self, position: int, value: int | str):
         """
@@ -225,6 +903,7 @@ class DecimalNumber:
         * value: value to assign to the digit. Can be an integer in [0, 9]
             Or a string in [0-9a-zA-Z]
         """
+        self.__raise_error_if_frozen()
         self.__raise_error_if_value_negative(value)
 
         if isinstance(value, str):
@@ -232,10 +911,48 @@ class DecimalNumber:
             value = STRING_TO_DIGIT[value]
 
         self.__check_valid_digit(value)
-        if value != 0:
-            self.__digits[position] = value
-        elif position in self.__digits.keys():
-            del self.__digits[position]
+        digits = self.__get_writable_digits()
+        self.__mantissa = None
+        index = position - self.__exponent
+        if len(digits) == 0:
+            if value != 0:
+                digits.append(value)
+                self.__exponent = position
+        elif index < 0:
+            if value != 0:
+                digits[0:0] = bytes(-index)
+                digits[0] = value
+                self.__exponent = position
+        elif index >= len(digits):
+            if value != 0:
+                digits.extend(bytes(index - len(digits) + 1))
+                digits[index] = value
+        else:
+            digits[index] = value
+            if value == 0:
+                self.__trim()
+
+    def __trim(self):
+        """
+        Remove zeros at both ends of self.__digits.
+        The number 0 gets exponent 0.
+        """
+        digits = self.__digits
+        end = len(digits)
+        while end > 0 and digits[end - 1] == 0:
+            end -= 1
+        if end == 0:
+            del digits[:]
+            self.__exponent = 0
+            return
+        start = 0
+        while start < end and digits[start] == 0:
+            start += 1
+        if end < len(digits):
+            del digits[end:]
+        if start > 0:
+            del digits[:start]
+            self.__exponent += start
 
     def __raise_error_if_value_negative(self, value: int | str):
         if ((isinstance(value, int) and value < 0)
@@ -249,7 +966,7 @@ class DecimalNumber:
         Check if d < self.base.
         Raise an error otherwise.
         """
-        if d < 0:
+        if d < 0 or d >= self.base:
             raise RuntimeError(
                 f"Digit value exceeds maximum digit value in base {self.base}")
 
@@ -257,10 +974,11 @@ class DecimalNumber:
         if not type(position) == int:
             raise IndexError(
                 "DecimalNumbers can only be indexed with integers")
-        elif position in self.__digits.keys():
-            return self.__digits[position]
+        index = position - self.__exponent
+        if 0 <= index < len(self.__get_digits()):
+            return self.__get_digits()[index]
         else:
-            # Zero-digits are not explicitly stored in self.__digits
+            # Zeros beyond both ends are not explicitly stored.
             return 0
 
     @property
@@ -268,81 +986,167 @@ class DecimalNumber:
         return self.__base
 
     def __str__(self) -> str:
-        digit_positions = self.__digits.keys()
-        if len(digit_positions) == 0:
+        if len(self.__get_digits()) == 0:
             return "0."
-        most_significant_pos = max(digit_positions)
-        least_significant_pos = min(digit_positions)
+        return b"".join(self.__iter_ascii(None)).decode("ascii")
 
-        if most_significant_pos < 0:
-            integer_part = ["0"]
-        else:
-            integer_part = ["0"]*(most_significant_pos+1)
-            for pos in range(most_significant_pos+1):
-                if pos in digit_positions:
-                    integer_part[most_significant_pos -
-                                 pos] = DIGIT_TO_STRING[self.__digits[pos]]
-
-        decimal_part = [""]
-        if least_significant_pos < 0:
-            decimal_part = ["0"]*abs(least_significant_pos)
-            for pos in range(-1, least_significant_pos - 1, -1):
-                if pos in digit_positions:
-                    decimal_part[-1 -
-                                 pos] = DIGIT_TO_STRING[self.__digits[pos]]
-
-        result = "-"*(not self.__is_positive)
-        result += "".join(integer_part) + "." + "".join(decimal_part)
-        return result
+    def to_file(self, path: str):
+        """
+        Write str(self) to the file at path,
+        converting FILE_CHUNK_SIZE digits at a time.
+        """
+        with open(path, "wb") as file:
+            for chunk in self.__iter_ascii(FILE_CHUNK_SIZE):
+                file.write(chunk)
+
+    def to_bytes(self) -> bytes:
+        """
+        Return self in a compact binary format,
+        see DecimalNumber.from_bytes() for the inverse.
+        Digits are packed with ceil(log2(base)) bits each,
+        e.g. 4 bits in base 10 and 16, and 5 bits in base 32.
+        """
+        digits = self.__get_digits()
+        width = _packed_width(self.base)
+        header = _PACKED_HEADER.pack(_PACKED_MAGIC, self.base,
+                                     int(not self.__is_positive), width,
+                                     self.__exponent, len(digits))
+        return header + _pack_digits(digits[::-1], width)
+
+    def to_packed_file(self, path: str):
+        """
+        Write self.to_bytes() to the file at path.
+        """
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    def __reduce__(self):
+        return (_unpickle_decimal_number,
+                (self.to_bytes(), self.__frozen, self.__int_backend))
+
+    def __iter_ascii(self, chunk_size: int | None) -> Iterator[bytes]:
+        """
+        Yield str(self) as ASCII bytes in pieces of
+        at most chunk_size digits (or all digits if chunk_size is None).
+        """
+        # Pad with zeros to include the first integer digit (position 0).
+        high = max(self.get_most_significant_pos(), 0)
+        low = min(self.get_lest_significant_pos(), 0)
+        if not self.__is_positive and len(self.__get_digits()) > 0:
+            yield b"-"
+        yield from self.__iter_ascii_range(high, 0, chunk_size)
+        yield b"."
+        yield from self.__iter_ascii_range(-1, low, chunk_size)
+
+    def __iter_ascii_range(self, top: int, bottom: int,
+                           chunk_size: int | None) -> Iterator[bytes]:
+        """
+        Yield the characters of the digits at positions top down to bottom,
+        in pieces of at most chunk_size digits.
+        """
+        if chunk_size is None:
+            chunk_size = max(top - bottom + 1, 1)
+        while top >= bottom:
+            yield self.__ascii_range(top, max(top - chunk_size + 1, bottom))
+            top -= chunk_size
+
+    def __ascii_range(self, top: int, bottom: int) -> bytes:
+        """
+        Return the characters of the digits at positions top down to bottom.
+        """
+        digits = self.__get_digits()
+        size = len(digits)
+        start = bottom - self.__exponent
+        end = top - self.__exponent + 1
+        core = digits[min(max(start, 0), size):min(max(end, 0), size)]
+        padded = (bytes(max(min(end, 0) - start, 0)) + core
+                  + bytes(max(end - max(start, size), 0)))
+        return padded[::-1].translate(DIGIT_TO_STRING_TABLE)
 
     def __repr__(self) -> str:
         return f'DecimalNumber.from_string("{str(self)}")'
 
-    def __eq__(self, other: DecimalNumber) -> bool:
-        max_pos = max(self.get_most_significant_pos(),
-                          other.get_most_significant_pos())
-        min_pos = min(self.get_lest_significant_pos(),
-                        other.get_lest_significant_pos())
-
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DecimalNumber):
+            return NotImplemented
         if other.base != self.base:
             return False
-        # If both are simply "0.", then the sign doesn't matter.
-        elif max_pos == 0 and min_pos == 0 and self[0] == 0 and other[0] == 0:
-            return True
-        elif self.sign != other.sign:
-            return False
-        else:
-            
-            for pos in range(max_pos, min_pos-1, -1):
-                if self[pos] != other[pos]:
-                    return False
-            return True
+        return self.__compare(other) == 0
+
     def __ge__(self, other: DecimalNumber) -> bool:
         self.__raise_error_if_incompatible_num(other)
-        return (self == other) | (self > other)
+        return self.__compare(other) >= 0
 
     def __gt__(self, other: DecimalNumber) -> bool:
         self.__raise_error_if_incompatible_num(other)
-        if self == other:
-            return False
-        elif self.sign > other.sign:
-            return True
-        elif self.sign < other.sign:
-            return False
+        return self.__compare(other) > 0
+
+    def __compare(self, other: DecimalNumber) -> int:
+        """
+        Return 1, 0 or -1 if self is greater than, equal to or less than other.
+
+        Decides on the signs first, then on the most significant positions
+        (see _compare_magnitude()), and only then compares digits.
+        """
+        # Signs, where 0 == -0 has sign 0.
+        sign_1 = 0 if self.__is_zero() else self.sign
+        sign_2 = 0 if other.__is_zero() else other.sign
+        if sign_1 != sign_2:
+            return 1 if sign_1 > sign_2 else -1
+        elif sign_1 == 0:
+            return 0
+        elif self.__int_backend or other.__int_backend:
+            # Aligning the mantissas multiplies by a power of the base
+            # as large as the gap between the exponents,
+            # so first decide on the most significant positions,
+            # which are exact only if the estimates are close.
+            top_1 = self.__estimate_top_position()
+            top_2 = other.__estimate_top_position()
+            if abs(top_1 - top_2) <= 2:
+                top_1 = self.__top_position()
+                top_2 = other.__top_position()
+            if top_1 != top_2:
+                return sign_1 if top_1 > top_2 else -sign_1
+            m_1, m_2, _ = self.__aligned_mantissas(other)
+            return (m_1 > m_2) - (m_1 < m_2)
         else:
-            # If both are negative, 
-            # then the number with the smallest magnitude is the greatest
-            bigger_mag_is_biggest = self.sign > 0
-            max_pos = max(self.get_most_significant_pos(),
-                          other.get_most_significant_pos())
-            min_pos = min(self.get_lest_significant_pos(),
-                          other.get_lest_significant_pos())
-            for pos in range(max_pos, min_pos-1, -1):
-                if self[pos] > other[pos]:
-                    return bigger_mag_is_biggest
-                if self[pos] < other[pos]:
-                    return not bigger_mag_is_biggest
-            return not bigger_mag_is_biggest
+            # If both are negative,
+            # then the number with the smallest magnitude is the greatest.
+            return sign_1 * self._compare_magnitude(other)
+
+    def __estimate_top_position(self) -> int:
+        """
+        Return the position of the most significant digit of self (nonzero)
+        up to an error of one, without materialising the digits.
+        """
+        if self.__digits is not None:
+            return self.__exponent + len(self.__digits) - 1
+        bits = self.__mantissa.bit_length()
+        return self.__exponent + int((bits - 1) / math.log2(self.base))
+
+    def __top_position(self) -> int:
+        """
+        Return the position of the most significant digit of self (nonzero),
+        without materialising the digits.
+        """
+        if self.__digits is not None:
+            return self.__exponent + len(self.__digits) - 1
+        mantissa = self.__mantissa
+        length = max(self.__estimate_top_position() - self.__exponent, 0)
+        power = self.base**length
+        while power > mantissa:
+            power //= self.base
+            length -= 1
+        while power*self.base <= mantissa:
+            power *= self.base
+            length += 1
+        return self.__exponent + length
+
+    def __is_zero(self) -> bool:
+        if self.__digits is not None:
+            return len(self.__digits) == 0
+        else:
+            return self.__mantissa == 0
 
     def __le__(self, other: DecimalNumber) -> bool:
         self.__raise_error_if_incompatible_num(other)
@@ -373,6 +1177,78 @@ class DecimalNumber:
         """
         return _decimal_number_from_string(str_repr, base)
 
+    @staticmethod
+    def from_file(path: str, base: int) -> DecimalNumber:
+        """
+        Same as DecimalNumber.from_string(), but read the string
+        from the file at path, FILE_CHUNK_SIZE characters at a time.
+        Trailing whitespace in the file is ignored.
+        """
+        def read_chunks():
+            with open(path, "rb") as file:
+                while chunk := file.read(FILE_CHUNK_SIZE):
+                    yield chunk
+        return _decimal_number_from_chunks(read_chunks(), base)
+
+    @staticmethod
+    def from_bytes(data: bytes | bytearray | memoryview | mmap.mmap,
+                   max_digits: Optional[int] = None) -> DecimalNumber:
+        """
+        Inverse of DecimalNumber.to_bytes().
+
+        Arguments:
+        * data: any bytes-like object, such as an mmap.mmap of a file
+            written by to_packed_file().
+        * max_digits: if not None, only read the [max_digits] (≥ 0)
+            most significant digits, and truncate the number after them.
+            Only the start of data is accessed then,
+            so for a memory-mapped file only the start is read from disk.
+        """
+        return _decimal_number_from_bytes(data, max_digits)
+
+    @staticmethod
+    def from_packed_file(path: str,
+                         max_digits: Optional[int] = None) -> DecimalNumber:
+        """
+        Same as DecimalNumber.from_bytes() for the contents of
+        the file at path, which is memory-mapped instead of read.
+        """
+        with open(path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return _decimal_number_from_bytes(data, max_digits)
+
+    @staticmethod
+    def from_digit_array(array: np.ndarray | Sequence[int], base: int,
+                         exponent: int = 0,
+                         sign: bool | int = 1) -> DecimalNumber:
+        """
+        Inverse of DecimalNumber.digits_view():
+        construct a DecimalNumber from an array of digits.
+
+        Arguments:
+        * array: 1D array of ints in [0, base),
+            most significant digit first.
+        * base: amount of different values that a single digit can have.
+        * exponent: position of the last digit of array.
+            E.g. exponent=-2 puts two digits after the floating point.
+        * sign: polarity of the DecimalNumber, see DecimalNumber().
+        """
+        if np is None:
+            raise ImportError(
+                "DecimalNumber.from_digit_array() requires NumPy.")
+        array = np.asarray(array)
+        if array.ndim != 1 or not (array.size == 0 or
+                                   np.issubdtype(array.dtype, np.integer)):
+            raise ValueError("Digits must be a 1D array of ints.")
+        if array.size > 0:
+            if array.min() < 0:
+                raise ValueError("Digits must be nonnegative.")
+            if array.max() >= base:
+                raise RuntimeError(
+                    f"Digit value exceeds maximum digit value in base {base}")
+        digits = array[::-1].astype(np.uint8).tobytes()
+        return DecimalNumber._from_digits(base, sign, digits, exponent)
+
     @staticmethod
     def from_int(int_value: int, base: int) -> DecimalNumber:
         """
@@ -384,66 +1260,369 @@ class DecimalNumber:
         * base: amount of different values that a single digit can have.
             Base 10 is 'normal' decimal notation, 2 is binary, 16 hexadecimal.
             This argument must satisfy 2 <= base <= 34
+
+        The result stores its digits, like a number from from_string():
+        use enable_int_backend() to keep it as an int instead.
         """
-        result = DecimalNumber(base, int_value >= 0)
-        result._add_to_digit(0, abs(int_value))
+        digits = int_to_digits(abs(int_value), base)
+        digits.reverse()
+        return DecimalNumber._from_digits(base, int_value >= 0, digits, 0)
+
+    @staticmethod
+    def _from_digits(base: int, sign: bool | int,
+                     digits: bytes | bytearray,
+                     exponent: int) -> DecimalNumber:
+        """
+        Construct a DecimalNumber from its digit values
+        (least significant digit first, each in [0, base)),
+        where digits[i] is the digit at position exponent + i.
+        The digits are not validated.
+        """
+        result = DecimalNumber(base, sign)
+        result.__digits = bytearray(digits)
+        result.__exponent = exponent
+        result.__trim()
         return result
 
 
-def _decimal_number_from_string(str_repr: str, base: int) -> DecimalNumber:
+def _iter_nonzero_digits(digits: bytes,
+                         exponent: int) -> Iterator[Tuple[int, int]]:
     """
-    Same as DecimalNumber.from_string().
+    Yield the (position, digit-value) pairs of DecimalNumber.__iter__()
+    for digits (least significant first) starting at position exponent.
     """
-    __check_base_is_valid(str_repr, base)
-    str_repr = str_repr.lower()
-    __check_valid_string_repr(str_repr)
+    for index in range(len(digits) - 1, -1, -1):
+        if digits[index] != 0:
+            yield exponent + index, digits[index]
 
-    result = DecimalNumber(base)
-    if str_repr[0] == "-":
-        result.set_sign(-1)
-        str_repr = str_repr[1:]
-    integer_part, decimal_part = str_repr.split(".")
-    integer_part = reversed(integer_part)
-    integer_part = tuple(map(lambda x: STRING_TO_DIGIT[x], integer_part))
-    decimal_part = tuple(map(lambda x: STRING_TO_DIGIT[x], decimal_part))
 
-    for i in range(len(integer_part)):
-        result[i] = integer_part[i]
+def _add_digits(result: bytearray, digits: bytes | bytearray,
+                index: int, base: int):
+    """
+    Add the digit array digits to result[index:], in place,
+    in a single pass with a running carry.
+    A carry out of the most significant digit of result is appended.
+    """
+    carry = 0
+    for digit in digits:
+        value = result[index] + digit + carry
+        if value >= base:
+            value -= base
+            carry = 1
+        else:
+            carry = 0
+        result[index] = value
+        index += 1
+    while carry:
+        if index == len(result):
+            result.append(1)
+            carry = 0
+        elif result[index] == base - 1:
+            result[index] = 0
+            index += 1
+        else:
+            result[index] += 1
+            carry = 0
 
-    i = -1
-    for digit in decimal_part:
-        result[i] = digit
-        i -= 1
 
-    return result
+def _subtract_digits(result: bytearray, digits: bytes | bytearray,
+                     index: int, base: int):
+    """
+    Subtract the digit array digits from result[index:], in place,
+    in a single pass with a running borrow.
+    The value of result must be at least that of the subtracted digits.
+    """
+    borrow = 0
+    for digit in digits:
+        value = result[index] - digit - borrow
+        if value < 0:
+            value += base
+            borrow = 1
+        else:
+            borrow = 0
+        result[index] = value
+        index += 1
+    while borrow:
+        if result[index] == 0:
+            result[index] = base - 1
+        else:
+            result[index] -= 1
+            borrow = 0
+        index += 1
+
+
+# Frozen numbers returned by DecimalNumber.zero() and base_power(),
+# by (base, exponent), where the exponent of 0 is None.
+_INTERNED: Dict[Tuple[int, int | None], DecimalNumber] = {}
+
+
+def _schoolbook_multiply(digits_1: bytearray, digits_2: bytearray,
+                         base: int) -> bytearray:
+    """
+    Return the digits of the product of two digit arrays
+    (least significant digit first), by long multiplication.
+    """
+    if len(digits_1) == 0 or len(digits_2) == 0:
+        return bytearray()
+    coefficients = [0]*(len(digits_1) + len(digits_2) - 1)
+    for i, digit_1 in enumerate(digits_1):
+        if digit_1 != 0:
+            for j, digit_2 in enumerate(digits_2):
+                coefficients[i + j] += digit_1 * digit_2
+    return _resolve_carries(coefficients, base)
+
+
+def _fft_multiply(digits_1: bytearray, digits_2: bytearray,
+                  base: int) -> bytearray | None:
+    """
+    Same as _schoolbook_multiply(), but computes the convolution
+    of the digits with a floating point FFT.
+    Return None if the rounding errors of the FFT are too large
+    to round to the exact convolution.
+    """
+    length = len(digits_1) + len(digits_2) - 1
+    size = 1 << (length - 1).bit_length()
+    spectrum = (np.fft.rfft(np.frombuffer(digits_1, dtype=np.uint8), size)
+                * np.fft.rfft(np.frombuffer(digits_2, dtype=np.uint8), size))
+    convolution = np.fft.irfft(spectrum, size)[:length]
+    rounded = np.rint(convolution)
+    if np.max(np.abs(convolution - rounded)) > 0.25:
+        return None
+    return _resolve_carries(rounded.astype(np.int64).tolist(), base)
+
+
+def _int_ratio_to_float(value: int, base: int, exponent: int) -> float:
+    """
+    Return the float nearest to value * base**exponent.
+    Python rounds int-to-float and int / int conversions correctly.
+    """
+    if exponent >= 0:
+        return float(value * base**exponent)
+    else:
+        return value / base**(-exponent)
+
+
+def _add_at(values: np.ndarray, digits: bytearray, offset: int,
+            factor: int = 1):
+    """
+    Add factor * digits to values[offset:offset + len(digits)].
+    """
+    values[offset:offset + len(digits)] += \
+        factor * np.frombuffer(digits, dtype=np.uint8).astype(np.int16)
+
+
+def _chain_inputs(generate: np.ndarray, propagate: np.ndarray) -> np.ndarray:
+    """
+    Vectorized carry (or borrow) resolution.
+
+    Position i emits a carry if generate[i],
+    or if propagate[i] and position i receives a carry.
+    Return the bool array of carries received by positions 0, ..., n,
+    where n = len(generate).
+    Position i receives the carry of the nearest position j < i
+    that does not propagate, if any.
+    """
+    length = len(generate)
+    stops = np.where(propagate, -1, np.arange(length))
+    last_stop = np.maximum.accumulate(stops)
+    received = np.zeros(length + 1, dtype=bool)
+    received[1:] = (last_stop >= 0) & generate[np.maximum(last_stop, 0)]
+    return received
 
 
-def __check_valid_string_repr(str_repr):
-    if re.fullmatch(r"-?[0-9a-z]+\.[0-9a-z]*", str_repr) is None:
+def _resolve_carries(coefficients: List[int], base: int) -> bytearray:
+    """
+    Return the digits of sum(coefficients[i] * base**i),
+    for nonnegative coefficients, least significant digit first.
+    """
+    digits = bytearray(len(coefficients))
+    carry = 0
+    for i, coefficient in enumerate(coefficients):
+        carry, digits[i] = divmod(coefficient + carry, base)
+    while carry > 0:
+        carry, digit = divmod(carry, base)
+        digits.append(digit)
+    return digits
+
+
+def _decimal_number_from_string(str_repr: str, base: int,
+                                require_point: bool = True) -> DecimalNumber:
+    """
+    Same as DecimalNumber.from_string().
+    If require_point is False, the floating point may be omitted,
+    as in "A" instead of "A.".
+    """
+    try:
+        data = str_repr.encode("ascii")
+    except UnicodeEncodeError:
+        raise ValueError("Invalid string representation.")
+    return _decimal_number_from_chunks((data,), base, require_point)
+
+
+# STRING_TO_DIGIT_TABLE, extended with markers for the floating point
+# and for whitespace. Both are greater than any digit value.
+_POINT = INVALID_DIGIT - 1
+_WHITESPACE = INVALID_DIGIT - 2
+_PARSE_TABLE = bytearray(STRING_TO_DIGIT_TABLE)
+_PARSE_TABLE[ord(".")] = _POINT
+for _character in b" \t\n\r":
+    _PARSE_TABLE[_character] = _WHITESPACE
+_PARSE_TABLE = bytes(_PARSE_TABLE)
+
+
+def _decimal_number_from_chunks(chunks: Iterable[bytes], base: int,
+                                require_point: bool = True) -> DecimalNumber:
+    """
+    Parse the ASCII string representation (see DecimalNumber.from_string())
+    that is the concatenation of chunks, followed by optional whitespace.
+    If require_point is False, the floating point may be omitted.
+
+    Every chunk is converted to digit values with a single bytes.translate(),
+    which also maps every invalid character to a value
+    that is caught by the final max() over all digits.
+    """
+    __check_base_is_valid(base)
+    digits = bytearray()
+    sign = 1
+    for chunk in chunks:
+        if len(digits) == 0 and chunk[:1] == b"-" and sign == 1:
+            sign = -1
+            chunk = chunk[1:]
+        digits += chunk.translate(_PARSE_TABLE)
+    while len(digits) > 0 and digits[-1] == _WHITESPACE:
+        digits.pop()
+
+    point = digits.find(_POINT)
+    if point == -1 and not require_point:
+        digits.append(_POINT)
+        point = len(digits) - 1
+    if point < 1 or digits.find(_POINT, point + 1) != -1:
+        raise ValueError("Invalid string representation.")
+    del digits[point]
+    max_digit = max(digits)
+    if max_digit >= _WHITESPACE:
         raise ValueError("Invalid string representation.")
+    elif max_digit >= base:
+        raise RuntimeError(
+            "Input string uses greater base than specified base.")
+    digits.reverse()
+    return DecimalNumber._from_digits(base, sign, digits,
+                                      -(len(digits) - point))
 
 
-def __check_base_is_valid(input_str: str, base: int):
+def __check_base_is_valid(base: int):
     if base > 35:
         raise NotImplementedError("Unly bases up to 34 are supported, "
                                   "for notational-practical reasons")
     elif base < 2:
         raise ValueError("Invalid base, must be 2 or greater.")
-    else:
-        max_digit = __find_max_digit_in_str(input_str)
-        if max_digit >= base:
-            raise RuntimeError(
-                "Input string uses greater base than specified base.")
 
 
-def __find_max_digit_in_str(decimal_string: str) -> int:
+def _packed_width(base: int) -> int:
+    """
+    Return the amount of bits used for every digit in DecimalNumber.to_bytes(),
+    which is ceil(log2(base)).
     """
-    Given an input string of the form "I.D" 
-    (see DecimalNumber.from_string for the syntax convention),
-    find the digit with the greatest value and return this value.
+    return (base - 1).bit_length()
+
+
+def _packed_size(count: int, width: int) -> int:
     """
-    decimal_string = decimal_string.replace(".", "").replace("-", "")
-    return max(STRING_TO_DIGIT[digit] for digit in decimal_string)
+    Return the amount of bytes of [count] digits packed with [width] bits.
+    """
+    return -(-count*width // 8)
+
+
+# _LOW_BITS[width] keeps the lowest [width] bits of a byte.
+_LOW_BITS = {width: bytes(value & (2**width - 1) for value in range(256))
+             for width in range(1, 8)}
+
+
+def _pack_digits(digits: bytes | bytearray, width: int) -> bytes:
+    """
+    Pack digits (one per byte) with [width] bits each,
+    the first digit in the highest bits.
+
+    Every 8 digits form a group of [width] bytes,
+    so the digits at index i start at byte (i // 8) * width.
+    The bytes after the last digit are left out.
+    """
+    if width == 8:
+        return bytes(digits)
+    size = _packed_size(len(digits), width)
+    groups = -(-len(digits) // 8)
+    digits = bytes(digits) + bytes(groups*8 - len(digits))
+    # The k-th digit of every group is placed in the lowest byte
+    # of a [width]-byte slot, and then shifted to its bits.
+    # The shifted digits fill disjoint bits, so OR-ing them
+    # as (big) ints combines all groups at once.
+    packed = 0
+    for k in range(8):
+        slots = bytearray(groups*width)
+        slots[width - 1::width] = digits[k::8]
+        packed |= int.from_bytes(slots, "big") << (width*(7 - k))
+    return packed.to_bytes(groups*width, "big")[:size]
+
+
+def _unpack_digits(packed: bytes, width: int, count: int) -> bytearray:
+    """
+    Inverse of _pack_digits(): return the first [count] packed digits.
+    packed must hold at least _packed_size(count, width) bytes.
+    """
+    if width == 8:
+        return bytearray(packed[:count])
+    groups = -(-count // 8)
+    packed = packed[:groups*width]
+    packed += bytes(groups*width - len(packed))
+    value = int.from_bytes(packed, "big")
+    digits = bytearray(groups*8)
+    for k in range(8):
+        slots = (value >> (width*(7 - k))).to_bytes(groups*width, "big")
+        digits[k::8] = slots[width - 1::width].translate(_LOW_BITS[width])
+    del digits[count:]
+    return digits
+
+
+def _decimal_number_from_bytes(data: bytes | bytearray | memoryview
+                               | mmap.mmap,
+                               max_digits: Optional[int]) -> DecimalNumber:
+    """
+    Same as DecimalNumber.from_bytes().
+    """
+    if max_digits is not None and max_digits < 0:
+        raise ValueError("max_digits must be nonnegative.")
+    if len(data) < _PACKED_HEADER.size:
+        raise ValueError("Truncated packed DecimalNumber.")
+    magic, base, negative, width, exponent, count = \
+        _PACKED_HEADER.unpack(data[:_PACKED_HEADER.size])
+    # Wider digits than needed are accepted, as written by earlier versions,
+    # which rounded the width up to 1, 2, 4 or 8 bits.
+    if (magic != _PACKED_MAGIC or not 2 <= base <= 34 or negative > 1
+            or not _packed_width(base) <= width <= 8):
+        raise ValueError("Invalid packed DecimalNumber.")
+    if max_digits is not None and max_digits < count:
+        exponent += count - max_digits
+        count = max_digits
+    end = _PACKED_HEADER.size + _packed_size(count, width)
+    if len(data) < end:
+        raise ValueError("Truncated packed DecimalNumber.")
+    digits = _unpack_digits(bytes(data[_PACKED_HEADER.size:end]), width,
+                            count)
+    if len(digits) > 0 and max(digits) >= base:
+        raise ValueError("Invalid packed DecimalNumber.")
+    digits.reverse()
+    return DecimalNumber._from_digits(base, -1 if negative else 1, digits,
+                                      exponent)
+
+
+def _unpickle_decimal_number(data: bytes, frozen: bool,
+                             int_backend: bool) -> DecimalNumber:
+    result = _decimal_number_from_bytes(data, None)
+    if int_backend:
+        result.enable_int_backend()
+    if frozen:
+        result = result.freeze()
+    return result
 
 
 def add_decimal_numbers(num_1: DecimalNumber, num_2: DecimalNumber) -> DecimalNumber:
@@ -460,43 +1639,50 @@ def add_decimal_numbers(num_1: DecimalNumber, num_2: DecimalNumber) -> DecimalNu
     if num_1.base != num_2.base:
         raise NotImplementedError(
             "Can only add DecimalNumbers of the same base.")
+    return __add_signed(num_1, num_2, num_2.sign)
+
+
+def subtract_decimal_numbers(num_1: DecimalNumber,
+                             num_2: DecimalNumber) -> DecimalNumber:
+    """
+    Return a new DecimalNumber instance
+    whose value is num_1 - num_2.
+
+    Operants must have the same base,
+    raise an error if they have different bases.
+    """
+    if num_1.base != num_2.base:
+        raise NotImplementedError(
+            "Can only subtract DecimalNumbers of the same base.")
+    return __add_signed(num_1, num_2, -num_2.sign)
 
-    if num_1.sign == num_2.sign:
+
+def __add_signed(num_1: DecimalNumber, num_2: DecimalNumber,
+                 sign_2: int) -> DecimalNumber:
+    """
+    Return num_1 + |num_2| * sign_2.
+    """
+    if num_1.sign == sign_2:
         return __add_decimal_numbers_same_sign(num_1, num_2)
     else:
-        return __add_decimal_numbers_opposite_sign(num_1, num_2)
+        return __add_decimal_numbers_opposite_sign(num_1, num_2, sign_2)
 
 
 def __add_decimal_numbers_same_sign(num_1: DecimalNumber,
                                     num_2: DecimalNumber) -> DecimalNumber:
-    result = num_1.copy()
-    for (pos, digit_value) in num_2:
-        result._add_to_digit(pos, digit_value)
-    return result
+    return DecimalNumber._add_magnitudes(num_1, num_2, num_1.sign)
 
 
 def __add_decimal_numbers_opposite_sign(num_1: DecimalNumber,
-                                        num_2: DecimalNumber) -> DecimalNumber:
-    # Find number greatest magnitute;
-    # subtract smallest from largest to avoid no-available-borrow problem.
-    # Set the correct sign separately.
-    num_1_inverted = num_1.copy()
-    num_1_inverted.set_sign(num_1.sign * -1)
-    if (num_1_inverted >= num_2):
-        if num_2.sign == 1:
-            biggest = num_1
-            smallest = num_2
-        else:
-            biggest = num_2
-            smallest = num_1
-    elif num_2.sign == 1:
-        biggest = num_2
-        smallest = num_1
+                                        num_2: DecimalNumber,
+                                        sign_2: int) -> DecimalNumber:
+    # Subtract the smallest magnitude from the largest
+    # to avoid the no-available-borrow problem.
+    # The result gets the sign of the largest.
+    comparison = num_1._compare_magnitude(num_2)
+    if comparison == 0:
+        return DecimalNumber(num_1.base)
+    elif comparison > 0:
+        return DecimalNumber._subtract_magnitudes(num_1, num_2, num_1.sign)
     else:
-        biggest = num_1
-        smallest = num_2
-    result = biggest.copy()
-    result.set_sign(biggest.sign)
-    for (pos, digit_value) in smallest:
-        result._subtract_from_digit(pos, digit_value)
-    return result
+        return DecimalNumber._subtract_magnitudes(num_2, num_1, sign_2)
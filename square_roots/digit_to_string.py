@@ -22,3 +22,18 @@ DIGIT_TO_STRING.update({ord(x) - HEX_OFFSET: x for x in ALPHABET})
 
 STRING_TO_DIGIT = {string: digit_value for digit_value, string
                    in DIGIT_TO_STRING.items()}
+
+# Tables for bytes.translate(), to convert many digits at once.
+# DIGIT_TO_STRING_TABLE maps a byte with a digit value
+# to the ASCII code of its character.
+# STRING_TO_DIGIT_TABLE maps ASCII characters (of either case)
+# to digit values, and every other byte to INVALID_DIGIT.
+INVALID_DIGIT = 255
+DIGIT_TO_STRING_TABLE = bytes.maketrans(
+    bytes(DIGIT_TO_STRING.keys()),
+    "".join(DIGIT_TO_STRING.values()).encode("ascii"))
+STRING_TO_DIGIT_TABLE = bytearray([INVALID_DIGIT]) * 256
+for string, digit_value in STRING_TO_DIGIT.items():
+    STRING_TO_DIGIT_TABLE[ord(string)] = digit_value
+    STRING_TO_DIGIT_TABLE[ord(string.upper())] = digit_value
+STRING_TO_DIGIT_TABLE = bytes(STRING_TO_DIGIT_TABLE)
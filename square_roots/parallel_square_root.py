@@ -0,0 +1,136 @@
+"""
+Copyright (C) 2021 Lulof Pirée, 
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+Compute many independent square roots on a pool of processes.
+
+Each job is a tuple (k, num_digits, base), as passed to
+compute_square_root(). Jobs are sent to the workers in chunks,
+so that short jobs do not each pay for a round-trip between processes.
+Only a bounded amount of chunks is submitted ahead of the consumer,
+so jobs may be an endless iterator, and a consumer that stops early
+does not wait for the remaining jobs.
+
+With packed=True, a worker does not format its result,
+but returns floor(sqrt(k) * base**(num_digits-1)) as little-endian bytes.
+That is about log2(base)/8 bytes per digit instead of one character,
+and the formatting is left to the consumer (see unpack_square_root()).
+"""
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, Future, ProcessPoolExecutor,
+                                wait)
+from itertools import islice
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from square_roots.compute_square_root import (Number,
+                                              compute_square_root,
+                                              _check_arguments,
+                                              _format_root,
+                                              _scaled_square_root)
+
+Job = Tuple[Number, int, int]
+
+
+def compute_square_roots_parallel(jobs: Iterable[Job],
+                                  max_workers: Optional[int] = None,
+                                  chunksize: int = 16,
+                                  ordered: bool = True,
+                                  packed: bool = False,
+                                  max_pending: Optional[int] = None
+                                  ) -> Iterator[Tuple[int, str | bytes]]:
+    """
+    Compute the square root of every job on a pool of processes,
+    and yield (index, result) pairs, where index is the position
+    of the job in jobs.
+
+    Arguments:
+    * jobs: tuples (k, num_digits, base), see compute_square_root().
+    * max_workers: amount of worker processes,
+        defaults to the amount of CPUs.
+    * chunksize: amount of jobs sent to a worker at once.
+    * ordered: if True, yield the results in the order of jobs.
+        If False, yield the results of every chunk as soon as it is done.
+    * packed: if True, yield bytes to be decoded with unpack_square_root()
+        instead of the output string of compute_square_root().
+    * max_pending: amount of chunks submitted but not yet yielded,
+        defaults to twice the amount of workers.
+
+    If the consumer stops early (e.g. by closing this generator),
+    the chunks that did not start yet are cancelled.
+    """
+    if chunksize < 1:
+        raise ValueError("Chunksize must be at least 1.")
+    if max_pending is None:
+        max_pending = 2 * (max_workers or os.cpu_count() or 1)
+    if max_pending < 1:
+        raise ValueError("Must allow at least one pending chunk.")
+    jobs = iter(jobs)
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    # Maps every pending future to the index of its first job.
+    pending: Dict[Future, int] = {}
+    # The pending futures in the order of submission.
+    submitted: deque[Future] = deque()
+    try:
+        start = 0
+        while True:
+            while len(pending) < max_pending:
+                chunk = list(islice(jobs, chunksize))
+                if not chunk:
+                    break
+                future = executor.submit(_compute_chunk, chunk, packed)
+                pending[future] = start
+                submitted.append(future)
+                start += len(chunk)
+            if not pending:
+                break
+
+            if ordered:
+                future = submitted.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = done.pop()
+                submitted.remove(future)
+            first = pending.pop(future)
+            for offset, result in enumerate(future.result()):
+                yield first + offset, result
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def unpack_square_root(packed: bytes, num_digits: int, base: int) -> str:
+    """
+    Convert a result of compute_square_roots_parallel(packed=True)
+    to the output string of compute_square_root().
+    """
+    root = int.from_bytes(packed, "little")
+    return _format_root(root, num_digits, base)
+
+
+def _compute_chunk(chunk: List[Job], packed: bool) -> List[str | bytes]:
+    """
+    Compute the results of a chunk of jobs in a worker process.
+    """
+    results = []
+    for k, num_digits, base in chunk:
+        if packed:
+            k = _check_arguments(num_digits, k, base)
+            root = _scaled_square_root(num_digits, k, base)
+            results.append(root.to_bytes((root.bit_length() + 7) // 8,
+                                         "little"))
+        else:
+            results.append(compute_square_root(num_digits, k, base))
+    return results
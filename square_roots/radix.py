@@ -0,0 +1,203 @@
+"""
+Copyright (C) 2021 Lulof Pirée, 
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+Conversion between Python ints and lists of digits in an arbitrary base.
+
+Both directions use divide-and-conquer:
+the number is split in two halves at a power base**(2**j),
+and both halves are converted recursively.
+The powers base**(2**j) are cached per base.
+Because Python's int multiplication is subquadratic (Karatsuba),
+this is much faster for long numbers than converting digit by digit.
+Python's int division is quadratic, however,
+so large splits divide by multiplying with a cached reciprocal
+of the power (see _floor_divide()).
+
+This module also provides that division for the other modules.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Below 2**_SMALL_LEVEL digits, convert digit by digit.
+_SMALL_LEVEL = 5
+
+# Below this many bits of divisor or quotient, integer division uses
+# Python's long division instead of a Newton reciprocal.
+NEWTON_DIVISION_THRESHOLD = 8000
+
+# Maps each base to the list [base**1, base**2, base**4, base**8, ...].
+_POWERS: Dict[int, List[int]] = {}
+
+# Maps each base to the list of reciprocals of the powers in _POWERS,
+# as returned by _power_reciprocal(), or None if not computed yet.
+_RECIPROCALS: Dict[int, List[Optional[int]]] = {}
+
+
+def _power(base: int, level: int) -> int:
+    """
+    Return base**(2**level), computed by repeated squaring and cached.
+    """
+    powers = _POWERS.setdefault(base, [base])
+    while len(powers) <= level:
+        powers.append(powers[-1] * powers[-1])
+    return powers[level]
+
+
+def _power_reciprocal(base: int, level: int) -> int:
+    """
+    Return _reciprocal(_power(base, level), precision),
+    with precision = _power(base, level).bit_length() + 32,
+    computed once and cached.
+    """
+    reciprocals = _RECIPROCALS.setdefault(base, [])
+    while len(reciprocals) <= level:
+        reciprocals.append(None)
+    if reciprocals[level] is None:
+        power = _power(base, level)
+        reciprocals[level] = _reciprocal(power, power.bit_length() + 32)
+    return reciprocals[level]
+
+
+def _divmod_power(value: int, base: int, level: int) -> Tuple[int, int]:
+    """
+    Return divmod(value, _power(base, level))
+    for 0 ≤ value < _power(base, level)**2.
+    """
+    power = _power(base, level)
+    if power.bit_length() < NEWTON_DIVISION_THRESHOLD:
+        return divmod(value, power)
+    return _newton_divmod(value, power, _power_reciprocal(base, level),
+                          power.bit_length() + 32)
+
+
+def int_to_digits(value: int, base: int, length: int = 0) -> List[int]:
+    """
+    Return the digits of a nonnegative int in the given base,
+    most significant digit first.
+
+    Arguments:
+    * value: nonnegative int to convert.
+    * base: base of the output digits, base ≥ 2.
+    * length: pad the result with leading zeros to at least this length.
+    """
+    if value < 0:
+        raise ValueError("Can only convert nonnegative integers.")
+    level = 0
+    while _power(base, level) <= value:
+        level += 1
+    digits = []
+    _emit_digits(value, base, level, digits)
+    # The top-level split may produce leading zeros.
+    first_nonzero = 0
+    while first_nonzero < len(digits) - 1 and digits[first_nonzero] == 0:
+        first_nonzero += 1
+    digits = digits[first_nonzero:]
+    if len(digits) < length:
+        digits = [0]*(length - len(digits)) + digits
+    return digits
+
+
+def _emit_digits(value: int, base: int, level: int, output: List[int]):
+    """
+    Append exactly 2**level digits of value to output,
+    most significant first. Requires value < base**(2**level).
+    """
+    if level <= _SMALL_LEVEL:
+        digits = [0]*(2**level)
+        for i in range(len(digits)-1, -1, -1):
+            value, digits[i] = divmod(value, base)
+        output.extend(digits)
+    else:
+        high, low = _divmod_power(value, base, level-1)
+        _emit_digits(high, base, level-1, output)
+        _emit_digits(low, base, level-1, output)
+
+
+def digits_to_int(digits: Sequence[int], base: int) -> int:
+    """
+    Inverse of int_to_digits():
+    return the int represented by the given digits,
+    most significant digit first.
+    """
+    if len(digits) <= 2**_SMALL_LEVEL:
+        value = 0
+        for digit in digits:
+            value = value*base + digit
+        return value
+    level = (len(digits) - 1).bit_length() - 1
+    split = len(digits) - 2**level
+    return (digits_to_int(digits[:split], base) * _power(base, level)
+            + digits_to_int(digits[split:], base))
+
+
+def _floor_divide(dividend: int, divisor: int) -> int:
+    """
+    Return dividend // divisor for nonnegative ints, divisor > 0.
+
+    Large divisions multiply the dividend with an approximation
+    of the reciprocal of the divisor (see _reciprocal()),
+    and correct the result with the exact remainder.
+    """
+    quotient_bits = dividend.bit_length() - divisor.bit_length()
+    if (quotient_bits < NEWTON_DIVISION_THRESHOLD
+            or divisor.bit_length() < NEWTON_DIVISION_THRESHOLD):
+        return dividend // divisor
+    precision = quotient_bits + 32
+    reciprocal = _reciprocal(divisor, precision)
+    return _newton_divmod(dividend, divisor, reciprocal, precision)[0]
+
+
+def _newton_divmod(dividend: int, divisor: int, reciprocal: int,
+                   precision: int) -> Tuple[int, int]:
+    """
+    Return divmod(dividend, divisor) for nonnegative ints,
+    where reciprocal = _reciprocal(divisor, precision)
+    and the quotient has at most precision - 32 bits.
+    """
+    # Only the leading bits of the dividend matter for the estimate.
+    drop = max(dividend.bit_length() - precision - 32, 0)
+    quotient = ((dividend >> drop) * reciprocal) \
+        >> (divisor.bit_length() + precision - drop)
+    remainder = dividend - quotient*divisor
+    while remainder < 0:
+        quotient -= 1
+        remainder += divisor
+    while remainder >= divisor:
+        quotient += 1
+        remainder -= divisor
+    return quotient, remainder
+
+
+def _reciprocal(divisor: int, precision: int) -> int:
+    """
+    Return approximately 2**(divisor.bit_length() + precision) / divisor,
+    with a relative error of about 2**-precision.
+
+    Computes the reciprocal with half the precision recursively,
+    and then performs one Newton step
+        r = r + r*(1 - divisor*r).
+    """
+    length = divisor.bit_length()
+    # Only the leading bits of the divisor matter for the reciprocal.
+    drop = max(length - precision - 16, 0)
+    leading = divisor >> drop
+    leading_length = length - drop
+    if precision <= 64:
+        return (1 << (leading_length + precision)) // leading
+    half = precision // 2 + 8
+    reciprocal = _reciprocal(divisor, half) << (precision - half)
+    scale = leading_length + precision
+    error = (1 << scale) - leading*reciprocal
+    return reciprocal + ((reciprocal*error) >> scale)
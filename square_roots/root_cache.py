@@ -0,0 +1,109 @@
+"""
+Copyright (C) 2021 Lulof Pirée, 
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+In-memory cache of computed square roots.
+
+For every (k, base) the cache keeps the SquareRootState
+of the longest computation so far.
+A request for fewer digits is answered from the stored root,
+a request for more digits continues the stored state.
+"""
+from collections import OrderedDict
+from fractions import Fraction
+import sys
+from typing import Tuple
+
+from square_roots.compute_square_root import (Number,
+                                              SquareRootState,
+                                              _check_arguments,
+                                              _format_root)
+
+
+class SquareRootCache:
+    """
+    Least-recently-used cache of square root computations,
+    bounded by the memory used by the stored states.
+
+    Attributes:
+    * max_bytes: the least recently used states are evicted
+        when the stored states use more memory than this.
+    * hits: amount of requests for which a state was stored.
+    * misses: amount of requests that started a new computation.
+    """
+
+    def __init__(self, max_bytes: int = 2**28):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.__states: OrderedDict[Tuple[Fraction, int], SquareRootState] \
+            = OrderedDict()
+        self.__sizes: OrderedDict[Tuple[Fraction, int], int] = OrderedDict()
+        self.__total_size = 0
+
+    def compute_square_root(self, num_digits: int, k: Number,
+                            base: int = 10) -> str:
+        """
+        Same as compute_square_root.compute_square_root(num_digits, k, base).
+        """
+        k = _check_arguments(num_digits, k, base)
+        key = (Fraction(*k), base)
+        state = self.__states.get(key)
+        if state is None:
+            self.misses += 1
+            state = SquareRootState._from_ratio(k, base)
+        else:
+            self.hits += 1
+            self.__forget(key)
+
+        if state.position < num_digits:
+            state.advance(num_digits - state.position)
+        self.__store(key, state)
+        root = state.root // base**(state.position - num_digits)
+        return _format_root(root, num_digits, base)
+
+    @property
+    def size(self) -> int:
+        """
+        Approximate amount of bytes used by the stored states.
+        """
+        return self.__total_size
+
+    def __len__(self) -> int:
+        return len(self.__states)
+
+    def clear(self):
+        """
+        Remove all stored states. The counters are kept.
+        """
+        self.__states.clear()
+        self.__sizes.clear()
+        self.__total_size = 0
+
+    def __store(self, key: Tuple[Fraction, int], state: SquareRootState):
+        size = (sys.getsizeof(state.root) + sys.getsizeof(state.remainder)
+                + sys.getsizeof(state.pair_remainder)
+                + sys.getsizeof(state.denominator))
+        if size > self.max_bytes:
+            return
+        while self.__total_size + size > self.max_bytes:
+            self.__forget(next(iter(self.__states)))
+        self.__states[key] = state
+        self.__sizes[key] = size
+        self.__total_size += size
+
+    def __forget(self, key: Tuple[Fraction, int]):
+        del self.__states[key]
+        self.__total_size -= self.__sizes.pop(key)
@@ -15,11 +15,18 @@ You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+from fractions import Fraction
+import os
+import pickle
+import tempfile
 from typing import Sequence, Tuple
 import unittest
 import warnings
 
+from square_roots.compute_square_root import compute_square_root, to_fraction
+import square_roots.decimal_num
 from square_roots.decimal_num import DecimalNumber
+from square_roots.digit_to_string import DIGIT_TO_STRING
 
 warnings.warn("Testcases still allow a NotImplementedError\n"
               "when doing arithmetic between numbers of different bases.\n"
@@ -28,6 +35,15 @@ warnings.warn("Testcases still allow a NotImplementedError\n"
 warnings.warn("DecimalNumber comparisons with integers not yet implemented or tested.")
 
 
+def int_backed(int_value: int, base: int) -> DecimalNumber:
+    """
+    Return DecimalNumber.from_int(int_value, base) with the int backend.
+    """
+    decnum = DecimalNumber.from_int(int_value, base)
+    decnum.enable_int_backend()
+    return decnum
+
+
 class DecimalNumberConstructorTestCase(unittest.TestCase):
     """
     Test class for infinite-precision numbers.
@@ -205,6 +221,89 @@ class DecimalNumberStringTestCase(unittest.TestCase):
         self.assertEqual(str(decnum), expected_str)
         self.assertEqual(repr(decnum), expected_repr)
 
+    def test_str_only_decimals(self):
+        decnum = DecimalNumber.from_string("-0.00fa", 16)
+        self.assertEqual("-0.00fa", str(decnum))
+
+    def test_from_string_upper_case(self):
+        decnum = DecimalNumber.from_string("-A0F.1d", 16)
+        self.assertEqual("-a0f.1d", str(decnum))
+
+    def test_from_string_invalid(self):
+        """
+        Error case: characters that are no digits,
+        or a missing integer part.
+        """
+        for input_str in ("1.#", ".5", "1-.2", "--1.", "1 .2", "1", "", "-",
+                          "1.é"):
+            with self.subTest(input_str=input_str):
+                with self.assertRaises(ValueError):
+                    DecimalNumber.from_string(input_str, 10)
+
+
+class DecimalNumberFileTestCase(unittest.TestCase):
+    """
+    Test class for infinite-precision numbers.
+
+    This testcase focuses on DecimalNumber.to_file() and from_file().
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "number.txt")
+        # Small chunks, so that numbers span several chunks.
+        chunk_size = square_roots.decimal_num.FILE_CHUNK_SIZE
+        square_roots.decimal_num.FILE_CHUNK_SIZE = 7
+        self.addCleanup(setattr, square_roots.decimal_num,
+                        "FILE_CHUNK_SIZE", chunk_size)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        for input_str in ("0.", "1.", "-123456789012345.6789012345678",
+                          "-0.0000000000000001", "100000000000000000000."):
+            with self.subTest(input_str=input_str):
+                decnum = DecimalNumber.from_string(input_str, 10)
+                decnum.to_file(self.path)
+                with open(self.path) as file:
+                    self.assertEqual(input_str, file.read())
+                result = DecimalNumber.from_file(self.path, 10)
+                self.assertEqual(input_str, str(result))
+
+    def test_cleared_to_zero(self):
+        """
+        Corner case: a number whose digits are all set to 0,
+        or a shifted 0, is written as "0.", like str() writes it.
+        """
+        decnum = DecimalNumber.from_string("0.00001", 10)
+        decnum[-5] = 0
+        zero = DecimalNumber.from_string("0.", 10)
+        zero.shift(-3)
+        for number in (decnum, zero, int_backed(0, 10).shifted(4)):
+            with self.subTest(number=number):
+                number.to_file(self.path)
+                with open(self.path) as file:
+                    self.assertEqual("0.", file.read())
+                self.assertEqual("0.", str(number))
+        self.assertEqual(DecimalNumber.from_string("0.", 10).to_bytes(),
+                         decnum.to_bytes())
+
+    def test_trailing_whitespace(self):
+        with open(self.path, "w") as file:
+            file.write("-12345678.9abcdef\n")
+        result = DecimalNumber.from_file(self.path, 16)
+        self.assertEqual("-12345678.9abcdef", str(result))
+
+    def test_digit_exceeds_base(self):
+        """
+        Error case: a digit in a later chunk is too large.
+        """
+        with open(self.path, "w") as file:
+            file.write("1010101010101010.10101012")
+        with self.assertRaises(RuntimeError):
+            DecimalNumber.from_file(self.path, 2)
+
 
 class DecimalNumberSignTestCase(unittest.TestCase):
     """
@@ -282,6 +381,49 @@ class DecimalNumberShiftTestCase(unittest.TestCase):
         expected = "3.fa9de"
         self.check_shift(base, input_str, expected, positions)
 
+    def test_shifted(self):
+        """
+        shifted() returns a new number and leaves self unchanged.
+        """
+        base = 16
+        decnum = DecimalNumber.from_string("3fa.9de", base)
+        result = decnum.shifted(-2)
+        self.assertEqual("3.fa9de", str(result))
+        self.assertEqual("3fa.9de", str(decnum))
+
+    def test_shifted_copy_on_write(self):
+        """
+        Modifying a shifted number or its source
+        does not affect the other, although they share digits.
+        """
+        base = 10
+        decnum = DecimalNumber.from_string("123.45", base)
+        result = decnum.shifted(1)
+        result[0] = 9
+        self.assertEqual("1239.5", str(result))
+        self.assertEqual("123.45", str(decnum))
+        decnum[2] = 0
+        self.assertEqual("23.45", str(decnum))
+        self.assertEqual("1239.5", str(result))
+        self.assertEqual("46.9", str(decnum + decnum))
+
+    def test_shifted_source_modified_first(self):
+        """
+        Corner case: the source of several shifted numbers
+        is modified before any of them.
+        """
+        base = 10
+        decnum = DecimalNumber.from_string("123.45", base)
+        result_1 = decnum.shifted(1)
+        result_2 = result_1.shifted(-3)
+        decnum[-1] = 0
+        self.assertEqual("123.05", str(decnum))
+        self.assertEqual("1234.5", str(result_1))
+        self.assertEqual("1.2345", str(result_2))
+        result_1[3] = 0
+        self.assertEqual("234.5", str(result_1))
+        self.assertEqual("1.2345", str(result_2))
+
 
 class DecimalNumberAddTestCase(unittest.TestCase):
     """
@@ -423,6 +565,858 @@ class DecimalNumberAddTestCase(unittest.TestCase):
             self.assertEqual(str(decnum), expected)
 
 
+class DecimalNumberIntBackendTestCase(unittest.TestCase):
+    """
+    Test class for infinite-precision numbers.
+
+    This testcase focuses on arithmetic with the int mantissa backend.
+    """
+
+    def test_add_long_carry(self):
+        """
+        Base case: 999...9 + 1 with a carry through every digit.
+        """
+        decnum = DecimalNumber.from_string("9"*5000 + ".9", 10)
+        decnum.enable_int_backend()
+        result = decnum + DecimalNumber.from_string("0.1", 10)
+        self.assertTrue(result.uses_int_backend())
+        self.assertEqual("1" + "0"*5000 + ".", str(result))
+        self.assertEqual(5000, result.get_most_significant_pos())
+
+    def test_int_operands_keep_digits(self):
+        """
+        Corner case: int operands do not switch a number
+        to the int backend, only enable_int_backend() does.
+        """
+        decnum = DecimalNumber.from_string("12.5", 10)
+        decnum += 1
+        decnum -= 3
+        decnum *= 2
+        self.assertFalse(decnum.uses_int_backend())
+        self.assertFalse((decnum + 1).uses_int_backend())
+        self.assertFalse((decnum - 1).uses_int_backend())
+        self.assertFalse((decnum * 7).uses_int_backend())
+        self.assertFalse(DecimalNumber.from_int(-120, 10).uses_int_backend())
+        self.assertEqual("21.", str(decnum))
+
+    def test_mixed_backends(self):
+        """
+        Base case: adding numbers with and without the int backend,
+        with opposite signs.
+        """
+        decnum_1 = DecimalNumber.from_string("1.34", 10)
+        decnum_2 = DecimalNumber.from_string("-98.01", 10)
+        decnum_2.enable_int_backend()
+        self.assertEqual("-96.67", str(decnum_1 + decnum_2))
+        self.assertEqual("-96.67", str(decnum_2 + decnum_1))
+
+    def test_compare(self):
+        """
+        Base case: comparisons between backends and exponents.
+        """
+        decnum_1 = DecimalNumber.from_string("-a.3e", 16)
+        decnum_2 = DecimalNumber.from_string("-a.3e0", 16)
+        decnum_1.enable_int_backend()
+        self.assertTrue(decnum_1 == decnum_2)
+        self.assertTrue(decnum_1 > int_backed(-11, 16))
+        self.assertFalse(decnum_1 > decnum_2)
+        self.assertTrue(int_backed(0, 16)
+                        == DecimalNumber.from_string("-0.", 16))
+
+    def test_set_digit(self):
+        """
+        Corner case: setting a digit invalidates the stored mantissa.
+        """
+        decnum = int_backed(120, 10)
+        decnum[-1] = 5
+        decnum[1] = 0
+        self.assertEqual(decnum, DecimalNumber.from_string("100.5", 10))
+        self.assertEqual("1100.5", str(decnum + 1000))
+
+
+class DecimalNumberCarryTestCase(unittest.TestCase):
+    """
+    Test class for infinite-precision numbers.
+
+    This testcase focuses on long carry and borrow chains,
+    both in the Python and in the vectorized implementation.
+    """
+
+    def set_vectorize_threshold(self, threshold: int):
+        module = square_roots.decimal_num
+        self.addCleanup(setattr, module, "VECTORIZE_THRESHOLD",
+                        module.VECTORIZE_THRESHOLD)
+        module.VECTORIZE_THRESHOLD = threshold
+
+    def check_both(self, base: int, num_1: str, num_2: str,
+                   expected_sum: str, expected_difference: str):
+        for threshold in (10**9, 1):
+            with self.subTest(threshold=threshold):
+                self.set_vectorize_threshold(threshold)
+                decnum_1 = DecimalNumber.from_string(num_1, base)
+                decnum_2 = DecimalNumber.from_string(num_2, base)
+                self.assertEqual(expected_sum, str(decnum_1 + decnum_2))
+                self.assertEqual(expected_difference,
+                                 str(decnum_1 - decnum_2))
+
+    def test_long_chain(self):
+        """
+        Corner case: 999...9.9 + 0.1 carries through every digit,
+        and 999...9.9 - (-0.1) as well.
+        Recursive carrying would exceed the recursion limit.
+        """
+        nines = "9"*5000 + ".9"
+        self.check_both(10, nines, "0.1", "1" + "0"*5000 + ".",
+                        "9"*5000 + ".8")
+        self.check_both(10, nines, "-0.1", "9"*5000 + ".8",
+                        "1" + "0"*5000 + ".")
+
+    def test_long_borrow(self):
+        """
+        Corner case: 1000...0 - 0.1 borrows through every digit.
+        """
+        self.check_both(2, "1" + "0"*5000 + ".", "0.1",
+                        "1" + "0"*5000 + ".1", "1"*5000 + ".1")
+
+    def test_mixed_chains(self):
+        """
+        Base case: several chains, in base 16.
+        """
+        self.check_both(16, "ff0ff.f", "10f01.1", "110001.", "ee1fe.e")
+
+    def test_add_to_digit_long_chain(self):
+        """
+        Corner case: _add_to_digit() with a carry through many digits.
+        """
+        decnum = DecimalNumber.from_string("9"*5000 + ".", 10)
+        decnum._add_to_digit(0, 1)
+        self.assertEqual("1" + "0"*5000 + ".", str(decnum))
+        decnum._subtract_from_digit(0, 1)
+        self.assertEqual("9"*5000 + ".", str(decnum))
+
+
+class DecimalNumberSubTestCase(unittest.TestCase):
+    """
+    Test class for infinite-precision numbers.
+
+    This testcase focuses subtracting two numbers.
+    """
+
+    def check_sub(self, base: int, num_1: str, num_2: str, expected_str: str):
+        decnum_1 = DecimalNumber.from_string(num_1, base)
+        decnum_2 = DecimalNumber.from_string(num_2, base)
+        result = str(decnum_1 - decnum_2)
+        self.assertEqual(expected_str, result)
+        # Operands should not be modified.
+        self.assertEqual(num_1, str(decnum_1))
+        self.assertEqual(num_2, str(decnum_2))
+
+    def test_sub_decimal(self):
+        """
+        Base case: 98.01 - 1.34 = 96.67
+        """
+        self.check_sub(10, "98.01", "1.34", "96.67")
+
+    def test_sub_negative_result(self):
+        """
+        Corner case: 1.34 - 98.01 = -96.67
+        """
+        self.check_sub(10, "1.34", "98.01", "-96.67")
+
+    def test_sub_negative_operand(self):
+        """
+        Corner case: 1.34 - (-98.01) = 99.35
+        """
+        self.check_sub(10, "1.34", "-98.01", "99.35")
+
+    def test_sub_long_borrow(self):
+        """
+        Corner case: 1000.0 - 0.001 = 999.999, borrowing through every digit.
+        """
+        self.check_sub(10, "1000.", "0.001", "999.999")
+
+    def test_sub_equal(self):
+        """
+        Corner case: x - x = 0.
+        """
+        self.check_sub(16, "-a.3e", "-a.3e", "0.")
+
+    def test_sub_same_leading_digits(self):
+        """
+        Corner case: the magnitudes only differ in the last digit.
+        """
+        self.check_sub(2, "101.0101", "101.01", "0.0001")
+        self.check_sub(2, "101.01", "101.0101", "-0.0001")
+
+    def test_sub_int(self):
+        """
+        Base case: subtract an int.
+        """
+        decnum = DecimalNumber.from_string("1f.2b", 16)
+        self.assertEqual("15.2b", str(decnum - 10))
+
+    def test_sub_mixed_bases(self):
+        decnum_1 = DecimalNumber.from_string("1.5", base=10)
+        decnum_2 = DecimalNumber.from_string("1.5", base=16)
+        with self.assertRaises(NotImplementedError):
+            decnum_1 - decnum_2
+
+
+class DecimalNumberMulTestCase(unittest.TestCase):
+    """
+    Test class for infinite-precision numbers.
+
+    This testcase focuses on multiplying two numbers,
+    with each of the multiplication algorithms.
+    """
+
+    def set_thresholds(self, schoolbook: int, fft: int):
+        module = square_roots.decimal_num
+        old = (module.SCHOOLBOOK_THRESHOLD, module.FFT_THRESHOLD)
+        module.SCHOOLBOOK_THRESHOLD, module.FFT_THRESHOLD = schoolbook, fft
+        self.addCleanup(setattr, module, "SCHOOLBOOK_THRESHOLD", old[0])
+        self.addCleanup(setattr, module, "FFT_THRESHOLD", old[1])
+
+    def check_mul(self, base: int, num_1: str, num_2: str, expected: str):
+        decnum_1 = DecimalNumber.from_string(num_1, base)
+        decnum_2 = DecimalNumber.from_string(num_2, base)
+        self.assertEqual(expected, str(decnum_1 * decnum_2))
+
+    def check_all_algorithms(self, base: int, num_1: str, num_2: str,
+                             expected: str):
+        for schoolbook, fft in ((10**9, 10**9), (0, 10**9), (0, 1)):
+            with self.subTest(schoolbook=schoolbook, fft=fft):
+                self.set_thresholds(schoolbook, fft)
+                self.check_mul(base, num_1, num_2, expected)
+
+    def test_mul_decimal(self):
+        """
+        Base case: 1.5 * -2.25 = -3.375
+        """
+        self.check_all_algorithms(10, "1.5", "-2.25", "-3.375")
+
+    def test_mul_hex_carries(self):
+        """
+        Corner case: ff.f * ff.f = ffe0.01 in base 16, with carries
+        through every digit.
+        """
+        self.check_all_algorithms(16, "ff.f", "ff.f", "ffe0.01")
+
+    def test_mul_long(self):
+        """
+        Base case: (10**300 - 1)**2 = 10**600 - 2*10**300 + 1.
+        """
+        nines = "9"*300 + "."
+        expected = "9"*299 + "8" + "0"*299 + "1."
+        self.check_all_algorithms(10, nines, nines, expected)
+
+    def test_mul_int(self):
+        """
+        Base case: multiplication with ints on either side.
+        """
+        decnum = DecimalNumber.from_string("1.01", 2)
+        self.assertEqual("110.01", str(decnum * 5))
+        self.assertEqual("110.01", str(5 * decnum))
+
+    def test_mul_zero(self):
+        """
+        Corner case: multiplication by zero.
+        """
+        decnum = DecimalNumber.from_string("12.5", 10)
+        self.assertEqual(DecimalNumber(10), decnum * DecimalNumber(10))
+
+    def test_mul_mixed_bases(self):
+        decnum_1 = DecimalNumber.from_string("1.5", base=10)
+        decnum_2 = DecimalNumber.from_string("1.5", base=16)
+        with self.assertRaises(NotImplementedError):
+            decnum_1 * decnum_2
+
+
+class DecimalNumberInPlaceTestCase(unittest.TestCase):
+    """
+    Test class for infinite-precision numbers.
+
+    These testcases test +=, -= and *=.
+    """
+    cases = (("1.5", "0.75"), ("99.99", "0.01"), ("-12.5", "3.25"),
+             ("3.25", "-12.5"), ("0.", "-7.7"), ("100.", "100."),
+             ("-0.001", "-999."), ("12.34", "12.34"))
+
+    def test_iadd(self):
+        for input_1, input_2 in self.cases:
+            with self.subTest(input_1=input_1, input_2=input_2):
+                decnum_1 = DecimalNumber.from_string(input_1, 10)
+                decnum_2 = DecimalNumber.from_string(input_2, 10)
+                expected = str(decnum_1 + decnum_2)
+                result = decnum_1
+                result += decnum_2
+                self.assertIs(decnum_1, result)
+                self.assertEqual(expected, str(result))
+                self.assertEqual(input_2, str(decnum_2))
+
+    def test_isub(self):
+        for input_1, input_2 in self.cases:
+            with self.subTest(input_1=input_1, input_2=input_2):
+                decnum_1 = DecimalNumber.from_string(input_1, 10)
+                decnum_2 = DecimalNumber.from_string(input_2, 10)
+                expected = str(decnum_1 - decnum_2)
+                result = decnum_1
+                result -= decnum_2
+                self.assertIs(decnum_1, result)
+                self.assertEqual(expected, str(result))
+                self.assertEqual(input_2, str(decnum_2))
+
+    def test_imul(self):
+        decnum = DecimalNumber.from_string("-1.5", 16)
+        result = decnum
+        result *= DecimalNumber.from_string("a.8", 16)
+        self.assertIs(decnum, result)
+        self.assertEqual("-d.c8", str(decnum))
+        result *= 2
+        self.assertEqual("-1b.9", str(decnum))
+
+    def test_iadd_self(self):
+        decnum = DecimalNumber.from_string("99.95", 10)
+        decnum += decnum
+        self.assertEqual("199.9", str(decnum))
+
+    def test_accumulate(self):
+        """
+        Base case: an accumulator loop, with ints and the int backend.
+        """
+        total = DecimalNumber(10)
+        step = DecimalNumber.from_string("0.37", 10)
+        for i in range(100):
+            total += step
+            total -= 1
+            total += DecimalNumber.from_int(i, 10)
+        self.assertEqual("4887.", str(total))
+
+    def test_shared_storage(self):
+        """
+        In-place operators do not modify numbers that share the digits.
+        """
+        decnum = DecimalNumber.from_string("12.5", 10)
+        shifted = decnum.shifted(1)
+        decnum += DecimalNumber.from_string("0.5", 10)
+        self.assertEqual("13.", str(decnum))
+        self.assertEqual("125.", str(shifted))
+
+    def test_vectorized(self):
+        digits = "9"*5000
+        decnum_1 = DecimalNumber.from_string(digits + ".9", 10)
+        decnum_2 = DecimalNumber.from_string("-" + digits + ".8", 10)
+        decnum_1 += decnum_2
+        self.assertEqual("0.1", str(decnum_1))
+        decnum_1 -= decnum_2
+        self.assertEqual(digits + ".9", str(decnum_1))
+
+
+class DecimalNumberDivTestCase(unittest.TestCase):
+    """
+    Test class for infinite-precision numbers.
+
+    This testcase focuses on dividing two numbers to a given precision.
+    """
+
+    def check_divide(self, base: int, num_1: str, num_2: str,
+                     num_decimals: int, expected: str):
+        decnum_1 = DecimalNumber.from_string(num_1, base)
+        decnum_2 = DecimalNumber.from_string(num_2, base)
+        result = decnum_1.divide(decnum_2, num_decimals)
+        self.assertEqual(DecimalNumber.from_string(expected, base), result)
+
+    def test_divide_decimal(self):
+        """
+        Base case: 1 / 3 = 0.333... truncated to 5 decimals.
+        """
+        self.check_divide(10, "1.", "3.", 5, "0.33333")
+
+    def test_divide_negative(self):
+        """
+        Corner case: the quotient is truncated towards zero.
+        -2 / 3 = -0.666...
+        """
+        self.check_divide(10, "-2.", "3.", 4, "-0.6666")
+        self.check_divide(10, "2.", "-3.", 4, "-0.6666")
+
+    def test_divide_binary(self):
+        """
+        Base case: 1.1bin / 0.01bin = 1.5 / 0.25 = 6 = 110bin.
+        """
+        self.check_divide(2, "1.1", "0.01", 3, "110.")
+
+    def test_divide_truncates_dividend(self):
+        """
+        Corner case: less decimals than the dividend has.
+        """
+        self.check_divide(16, "a.bcdef", "2.", 2, "5.5e")
+
+    def test_divide_newton(self):
+        """
+        Base case: long operands use the Newton reciprocal,
+        and still give the exact truncated quotient.
+        """
+        base = 10
+        divisor = DecimalNumber.from_string("7" + "3"*3000 + ".", base)
+        quotient = DecimalNumber.from_string("9"*4000 + ".5", base)
+        dividend = divisor * quotient + 17
+        result = dividend.divide(divisor, 1)
+        self.assertEqual(quotient, result)
+
+    def test_truediv(self):
+        """
+        Base case: the / operator uses DIVISION_DECIMALS decimals.
+        """
+        decnum = DecimalNumber.from_string("1.", 10)
+        expected = "0." + "142857"*20
+        result = decnum / 7
+        self.assertEqual(square_roots.decimal_num.DIVISION_DECIMALS,
+                         -result.get_lest_significant_pos())
+        self.assertTrue(expected.startswith(str(result)))
+
+    def test_divide_by_zero(self):
+        """
+        Error case: division by zero.
+        """
+        with self.assertRaises(ZeroDivisionError):
+            DecimalNumber.from_string("1.", 10) / DecimalNumber(10)
+
+
+class DecimalNumberToBaseTestCase(unittest.TestCase):
+    """
+    Test class for infinite-precision numbers.
+
+    These testcases test conversion to another base.
+    """
+
+    def test_integer(self):
+        decnum = DecimalNumber.from_string("-ff.", 16)
+        self.assertEqual("-255.", str(decnum.to_base(10, 5)))
+        self.assertEqual("-11111111.", str(decnum.to_base(2, 0)))
+
+    def test_exact_fraction(self):
+        """
+        Base case: binary fractions are finite in base 10.
+        """
+        decnum = DecimalNumber.from_string("101.011", 2)
+        self.assertEqual("5.375", str(decnum.to_base(10, 10)))
+
+    def test_truncated(self):
+        """
+        Base case: 0.1 in base 3 is 1/3, which is truncated.
+        """
+        decnum = DecimalNumber.from_string("-0.1", 3)
+        self.assertEqual("-0.3333", str(decnum.to_base(10, 4)))
+        self.assertEqual("-0.2", str(decnum.to_base(6, 4)))
+
+    def test_positive_exponent(self):
+        decnum = DecimalNumber.from_string("12.", 10)
+        decnum.shift(30)
+        self.assertEqual(str(12 * 10**30) + ".", str(decnum.to_base(10, 3)))
+        self.assertEqual(decnum, decnum.to_base(10, 0))
+
+    def test_round_trip(self):
+        """
+        Base case: fractions in base 10 are finite in base 20,
+        so converting there and back gives the original number.
+        """
+        digits = "3141592653589793238462643383279502884197"*30
+        decnum = DecimalNumber.from_string(digits[:300] + "." + digits[300:],
+                                           10)
+        converted = decnum.to_base(20, len(digits))
+        self.assertEqual(decnum, converted.to_base(10, len(digits)))
+
+    def test_square_root(self):
+        """
+        A root computed in base 16 gives the same digits in base 10.
+        """
+        root = DecimalNumber.from_string(compute_square_root(70, 2, 16), 16)
+        self.assertEqual(compute_square_root(51, 2, 10),
+                         str(root.to_base(10, 50)))
+
+    def test_long_square_root(self):
+        """
+        Base case: thousands of digits, so that the conversion
+        divides with Newton reciprocals, from a power-of-two base
+        and from base 10.
+        """
+        root = DecimalNumber.from_string(compute_square_root(2600, 2, 16), 16)
+        expected = compute_square_root(3001, 2, 10)
+        self.assertEqual(expected, str(root.to_base(10, 3000)))
+        root = DecimalNumber.from_string(compute_square_root(4000, 2, 10), 10)
+        self.assertEqual(compute_square_root(3001, 2, 9),
+                         str(root.to_base(9, 3000)))
+
+    def test_invalid_base(self):
+        decnum = DecimalNumber.from_string("1.5", 10)
+        with self.assertRaises(ValueError):
+            decnum.to_base(1, 5)
+        with self.assertRaises(NotImplementedError):
+            decnum.to_base(40, 5)
+
+
+class DecimalNumberConversionTestCase(unittest.TestCase):
+    """
+    Test class for infinite-precision numbers.
+
+    These testcases test int(), float() and round().
+    """
+
+    def test_int(self):
+        for input_str, base, expected in (("123.99", 10, 123),
+                                          ("-123.99", 10, -123),
+                                          ("0.99", 10, 0),
+                                          ("-ff.8", 16, -255),
+                                          ("101.", 2, 5)):
+            with self.subTest(input_str=input_str):
+                decnum = DecimalNumber.from_string(input_str, base)
+                self.assertEqual(expected, int(decnum))
+        decnum = DecimalNumber.from_string("12.", 10)
+        decnum.shift(40)
+        self.assertEqual(12 * 10**40, int(decnum))
+
+    def test_int_int_backend(self):
+        decnum = int_backed(-12345, 10)
+        decnum.shift(-2)
+        self.assertEqual(-123, int(decnum))
+
+    def test_float(self):
+        for input_str, base in (("0.1", 10), ("-123.456", 10), ("ff.f", 16),
+                                ("0.1", 3), ("3." + "14159"*40, 10),
+                                ("-0." + "0"*300 + "1", 10)):
+            with self.subTest(input_str=input_str, base=base):
+                decnum = DecimalNumber.from_string(input_str, base)
+                self.assertEqual(float(to_fraction(input_str, base)),
+                                 float(decnum))
+
+    def test_float_halfway(self):
+        """
+        Corner case: numbers just above, at and below the midpoint
+        between 1 and the next float, which need all digits.
+        """
+        midpoint = Fraction(1) + Fraction(1, 2**53)
+        base = 10
+        for offset in (Fraction(1, 10**80), 0, -Fraction(1, 10**80)):
+            with self.subTest(offset=offset):
+                value = midpoint + offset
+                decimals = value - 1
+                digits = str(decimals.numerator * 10**80
+                             // decimals.denominator).zfill(80)
+                decnum = DecimalNumber.from_string("1." + digits, base)
+                self.assertEqual(float(value), float(decnum))
+
+    def test_round(self):
+        for input_str, base, ndigits, expected in (
+                ("1.2345", 10, 2, "1.23"),
+                ("1.235", 10, 2, "1.24"),
+                ("1.245", 10, 2, "1.24"),
+                ("1.2451", 10, 2, "1.25"),
+                ("-9.996", 10, 2, "-10."),
+                ("1234.5", 10, -2, "1200."),
+                ("1.1", 2, 0, "10."),
+                ("0.1", 2, 0, "0."),
+                ("1.11", 2, 0, "10."),
+                ("0.111", 3, 0, "0."),
+                ("0.112", 3, 0, "1."),
+                ("0.004", 10, 1, "0."),
+                ("1.5", 10, 3, "1.5")):
+            with self.subTest(input_str=input_str, ndigits=ndigits):
+                decnum = DecimalNumber.from_string(input_str, base)
+                self.assertEqual(expected, str(round(decnum, ndigits)))
+                self.assertEqual(input_str, str(decnum))
+
+    def test_round_int_backend(self):
+        decnum = int_backed(-12355, 10)
+        decnum.shift(-3)
+        self.assertEqual("-12.36", str(round(decnum, 2)))
+        decnum = int_backed(125, 10)
+        decnum.shift(-1)
+        self.assertEqual("12.", str(round(decnum, 0)))
+
+    def test_round_to_int(self):
+        self.assertEqual(2, round(DecimalNumber.from_string("2.5", 10)))
+        self.assertEqual(-4, round(DecimalNumber.from_string("-3.5", 10)))
+        self.assertEqual(3, round(DecimalNumber.from_string("2.51", 10)))
+
+
+class DecimalNumberFreezeTestCase(unittest.TestCase):
+    """
+    Test class for infinite-precision numbers.
+
+    These testcases test frozen (hashable) numbers.
+    """
+
+    def test_hash_equal_numbers(self):
+        """
+        Equal numbers have equal hashes, however they were computed.
+        """
+        decnum_1 = DecimalNumber.from_string("123.45", 10)
+        decnum_2 = DecimalNumber.from_string("0.45", 10) \
+            + DecimalNumber.from_int(123, 10)
+        decnum_3 = int_backed(12345, 10)
+        decnum_3.shift(-2)
+        frozen = {decnum_1.freeze(), decnum_2.freeze(), decnum_3.freeze()}
+        self.assertEqual(1, len(frozen))
+        self.assertIn(DecimalNumber.from_string("123.450", 10).freeze(),
+                      frozen)
+        self.assertNotIn(DecimalNumber.from_string("-123.45", 10).freeze(),
+                         frozen)
+
+    def test_unfrozen_unhashable(self):
+        with self.assertRaises(TypeError):
+            hash(DecimalNumber.from_string("1.5", 10))
+
+    def test_frozen_immutable(self):
+        frozen = DecimalNumber.from_string("1.5", 10).freeze()
+        self.assertTrue(frozen.is_frozen())
+        with self.assertRaises(TypeError):
+            frozen[0] = 2
+        with self.assertRaises(TypeError):
+            frozen.set_sign(-1)
+        with self.assertRaises(TypeError):
+            frozen.shift(1)
+        self.assertFalse(frozen.copy().is_frozen())
+        self.assertIs(frozen, frozen.freeze())
+
+    def test_in_place_operators(self):
+        """
+        += on a frozen number binds the name to a new number.
+        """
+        frozen = DecimalNumber.from_string("1.5", 10).freeze()
+        decnum = frozen
+        decnum += 1
+        decnum *= 2
+        self.assertEqual("5.", str(decnum))
+        self.assertEqual("1.5", str(frozen))
+
+    def test_freeze_keeps_original_mutable(self):
+        decnum = DecimalNumber.from_string("1.5", 10)
+        frozen = decnum.freeze()
+        decnum[0] = 7
+        self.assertEqual("7.5", str(decnum))
+        self.assertEqual("1.5", str(frozen))
+
+    def test_interned(self):
+        self.assertIs(DecimalNumber.zero(10),
+                      DecimalNumber.from_string("-0.", 10).freeze())
+        self.assertIs(DecimalNumber.base_power(16),
+                      DecimalNumber.from_string("1.", 16).freeze())
+        self.assertIs(DecimalNumber.base_power(2, -3),
+                      DecimalNumber.from_string("0.001", 2).freeze())
+        self.assertIsNot(DecimalNumber.base_power(10), DecimalNumber.zero(10))
+        self.assertEqual("1000.", str(DecimalNumber.base_power(10, 3)))
+
+    def test_interned_int_backend(self):
+        """
+        Corner case: powers of the base with the int backend are interned
+        as well, also when their mantissa has trailing zeros.
+        """
+        self.assertIs(DecimalNumber.base_power(10, 2),
+                      int_backed(100, 10).freeze())
+        self.assertIs(DecimalNumber.base_power(3, -2),
+                      int_backed(9, 3).shifted(-4).freeze())
+        self.assertIs(DecimalNumber.zero(7),
+                      int_backed(0, 7).freeze())
+        self.assertIsNot(DecimalNumber.base_power(10, 2),
+                         int_backed(101, 10).freeze())
+        self.assertFalse(int_backed(-100, 10).freeze()
+                         == DecimalNumber.base_power(10, 2))
+
+    def test_compare_to_other_types(self):
+        """
+        Corner case: == and != with objects that are not DecimalNumbers
+        are False and True, also for frozen numbers.
+        """
+        frozen = DecimalNumber.from_string("1.", 10).freeze()
+        self.assertFalse(frozen == None)
+        self.assertFalse(frozen == 1)
+        self.assertTrue(frozen != "1.")
+        self.assertNotIn(frozen, {1: "one"})
+
+    def test_frozen_int_backend(self):
+        """
+        Error case: enabling the int backend modifies the number.
+        """
+        frozen = DecimalNumber.from_string("1.5", 10).freeze()
+        with self.assertRaises(TypeError):
+            frozen.enable_int_backend()
+
+
+class DecimalNumberBytesTestCase(unittest.TestCase):
+    """
+    Test class for infinite-precision numbers.
+
+    These testcases test the binary format of to_bytes() and pickling.
+    """
+
+    def test_round_trip(self):
+        for input_str, base in (("0.", 10), ("-0.001", 2), ("1210.12", 3),
+                                ("-123.456", 10), ("fedcba9876.54321", 16),
+                                ("xwv.0001", 34), ("-7.", 8)):
+            with self.subTest(input_str=input_str, base=base):
+                decnum = DecimalNumber.from_string(input_str, base)
+                result = DecimalNumber.from_bytes(decnum.to_bytes())
+                self.assertEqual(input_str, str(result))
+                self.assertEqual(base, result.base)
+
+    def test_packed_size(self):
+        """
+        Base case: two decimal digits per byte.
+        """
+        decnum = DecimalNumber.from_string("1234567890.123", 10)
+        header_size = len(DecimalNumber.from_string("0.", 10).to_bytes())
+        self.assertEqual(header_size + 7, len(decnum.to_bytes()))
+
+    def test_packed_size_base_32(self):
+        """
+        Base case: base-32 digits take 5 bits, so 8 digits fit in 5 bytes,
+        and a 6th byte holds the remaining digit of 9.
+        """
+        header_size = len(DecimalNumber.from_string("0.", 32).to_bytes())
+        decnum = DecimalNumber.from_string("vutsrqpo.n", 32)
+        self.assertEqual(header_size + 6, len(decnum.to_bytes()))
+        decnum = DecimalNumber.from_string("1" + "v"*799 + ".", 32)
+        self.assertEqual(header_size + 500, len(decnum.to_bytes()))
+
+    def test_all_widths(self):
+        """
+        Base case: every base, including the 3-, 5- and 6-bit widths,
+        for lengths that end anywhere within a group of 8 digits,
+        also when only the leading digits are read.
+        """
+        for base in range(2, 35):
+            for length in range(1, 20):
+                digits = "".join(DIGIT_TO_STRING[1 + 7*i % (base - 1)]
+                                 for i in range(length))
+                input_str = "1" + digits[:-1] + "." + digits[-1]
+                with self.subTest(base=base, length=length):
+                    data = DecimalNumber.from_string(input_str, base) \
+                        .to_bytes()
+                    self.assertEqual(input_str,
+                                     str(DecimalNumber.from_bytes(data)))
+                    leading = DecimalNumber.from_bytes(data, length)
+                    self.assertEqual(input_str[:-1], str(leading))
+
+    def test_legacy_widths(self):
+        """
+        Base case: data written with digits wider than needed
+        (8 bits in base 32, 4 bits in base 6) can still be read.
+        """
+        header = square_roots.decimal_num._PACKED_HEADER
+        data = header.pack(b"DNUM", 32, 0, 8, -1, 3) + bytes([31, 0, 10])
+        self.assertEqual("v0.a", str(DecimalNumber.from_bytes(data)))
+        data = header.pack(b"DNUM", 6, 1, 4, 0, 3) + bytes([0x52, 0x30])
+        self.assertEqual("-523.", str(DecimalNumber.from_bytes(data)))
+
+    def test_max_digits(self):
+        decnum = DecimalNumber.from_string("-12345.6789", 10)
+        data = decnum.to_bytes()
+        self.assertEqual("-12300.", str(DecimalNumber.from_bytes(data, 3)))
+        self.assertEqual("-12345.67", str(DecimalNumber.from_bytes(data, 7)))
+        self.assertEqual(str(decnum), str(DecimalNumber.from_bytes(data, 50)))
+        self.assertEqual("0.", str(DecimalNumber.from_bytes(data, 0)))
+        with self.assertRaises(ValueError):
+            DecimalNumber.from_bytes(data, -1)
+
+    def test_packed_file(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "number.bin")
+        decnum = DecimalNumber.from_string("1." + "4142135623"*100, 10)
+        decnum.to_packed_file(path)
+        self.assertEqual(decnum, DecimalNumber.from_packed_file(path))
+        self.assertEqual("1.414213562",
+                         str(DecimalNumber.from_packed_file(path, 10)))
+
+    def test_invalid(self):
+        data = DecimalNumber.from_string("123.45", 10).to_bytes()
+        for invalid in (b"", data[:-1], b"X" + data[1:],
+                        data[:-1] + bytes([0xff])):
+            with self.subTest(invalid=invalid):
+                with self.assertRaises(ValueError):
+                    DecimalNumber.from_bytes(invalid)
+
+    def test_pickle(self):
+        decnum = DecimalNumber.from_string("-123.45", 10)
+        result = pickle.loads(pickle.dumps(decnum))
+        self.assertEqual(decnum, result)
+        self.assertFalse(result.is_frozen())
+
+        decnum = int_backed(12345, 16)
+        result = pickle.loads(pickle.dumps(decnum))
+        self.assertEqual(decnum, result)
+        self.assertTrue(result.uses_int_backend())
+
+    def test_pickle_frozen(self):
+        frozen = DecimalNumber.from_string("1.5", 10).freeze()
+        result = pickle.loads(pickle.dumps(frozen))
+        self.assertTrue(result.is_frozen())
+        self.assertEqual(hash(frozen), hash(result))
+        self.assertIs(DecimalNumber.base_power(10),
+                      pickle.loads(pickle.dumps(DecimalNumber.base_power(10))))
+
+
+@unittest.skipIf(square_roots.decimal_num.np is None, "requires NumPy")
+class DecimalNumberDigitsViewTestCase(unittest.TestCase):
+    """
+    Test class for infinite-precision numbers.
+
+    These testcases test digits_view() and from_digit_array().
+    """
+
+    def test_digits_view(self):
+        decnum = DecimalNumber.from_string("-a0f.1d", 16)
+        view = decnum.digits_view()
+        self.assertEqual([10, 0, 15, 1, 13], view.tolist())
+        self.assertEqual(-2, decnum.get_lest_significant_pos())
+        self.assertFalse(view.flags.writeable)
+        self.assertEqual(0, len(DecimalNumber(10).digits_view()))
+
+    def test_no_copy(self):
+        decnum = DecimalNumber.from_string("123.45", 10)
+        self.assertTrue(square_roots.decimal_num.np.shares_memory(
+            decnum.digits_view(), decnum.digits_view()))
+
+    def test_modify_after_view(self):
+        """
+        Modifying a number keeps the digits of an existing view,
+        even when the amount of digits changes.
+        """
+        decnum = DecimalNumber.from_string("123.45", 10)
+        view = decnum.digits_view()
+        decnum[5] = 9
+        decnum += DecimalNumber.from_string("0.001", 10)
+        self.assertEqual("900123.451", str(decnum))
+        self.assertEqual([1, 2, 3, 4, 5], view.tolist())
+        self.assertEqual([9, 0, 0, 1, 2, 3, 4, 5, 1],
+                         decnum.digits_view().tolist())
+
+    def test_round_trip(self):
+        for input_str, base in (("0.", 10), ("-123.45", 10), ("1000.", 2),
+                                ("0.00xa", 34)):
+            with self.subTest(input_str=input_str):
+                decnum = DecimalNumber.from_string(input_str, base)
+                result = DecimalNumber.from_digit_array(
+                    decnum.digits_view(), base,
+                    decnum.get_lest_significant_pos(), decnum.sign)
+                self.assertEqual(input_str, str(result))
+
+    def test_from_digit_array(self):
+        result = DecimalNumber.from_digit_array([0, 3, 1, 4, 0], 10, -3, -1)
+        self.assertEqual("-3.14", str(result))
+
+    def test_from_invalid_digit_array(self):
+        with self.assertRaises(RuntimeError):
+            DecimalNumber.from_digit_array([1, 10], 10)
+        with self.assertRaises(ValueError):
+            DecimalNumber.from_digit_array([1, -1], 10)
+        with self.assertRaises(ValueError):
+            DecimalNumber.from_digit_array([[1, 2]], 10)
+        with self.assertRaises(ValueError):
+            DecimalNumber.from_digit_array([1.5], 10)
+
+
 class DecimalNumberIterTestCase(unittest.TestCase):
     """
     Test class for infinite-precision numbers.
@@ -468,6 +1462,88 @@ class DecimalNumberIterTestCase(unittest.TestCase):
         expected = ((1, 1), (-1, 3))
         self.check_iter(base, input_str, expected)
 
+    def test_iter_while_modifying(self):
+        """
+        Corner case: the number is modified during the iteration,
+        which moves its most and least significant positions.
+        """
+        decnum = DecimalNumber.from_string("105.", 10)
+        pairs = []
+        for pos, digit in decnum:
+            pairs.append((pos, digit))
+            decnum[pos] = 0
+        self.assertListEqual([(2, 1), (0, 5)], pairs)
+        self.assertEqual("0.", str(decnum))
+
+        decnum = DecimalNumber.from_string("3.25", 10)
+        iterator = iter(decnum)
+        decnum[-2] = 0
+        decnum[4] = 7
+        self.assertTupleEqual(((0, 3), (-1, 2), (-2, 5)), tuple(iterator))
+
+class DecimalNumberStorageTestCase(unittest.TestCase):
+    """
+    Test class for infinite-precision numbers.
+
+    This testcase focuses on setting digits at and beyond both ends
+    of the stored digits.
+    """
+
+    def test_set_beyond_ends(self):
+        """
+        Base case: setting digits far from the existing digits.
+        """
+        decnum = DecimalNumber.from_string("5.", 10)
+        decnum[4] = 3
+        decnum[-3] = 7
+        self.assertEqual("30005.007", str(decnum))
+        self.assertEqual(4, decnum.get_most_significant_pos())
+        self.assertEqual(-3, decnum.get_lest_significant_pos())
+
+    def test_clear_ends(self):
+        """
+        Corner case: setting the outer digits to 0
+        moves the most and least significant positions.
+        """
+        decnum = DecimalNumber.from_string("30005.007", 10)
+        decnum[4] = 0
+        decnum[-3] = 0
+        self.assertEqual("5.", str(decnum))
+        self.assertEqual(0, decnum.get_most_significant_pos())
+        self.assertEqual(0, decnum.get_lest_significant_pos())
+        decnum[0] = 0
+        self.assertEqual("0.", str(decnum))
+        self.assertTupleEqual((), tuple(decnum))
+
+    def test_only_decimals(self):
+        """
+        Corner case: numbers without integer digits, or without decimals.
+        """
+        self.assertEqual("0.0012",
+                         str(DecimalNumber.from_string("0.00120", 10)))
+        self.assertEqual("1200.",
+                         str(DecimalNumber.from_string("01200.", 10)))
+
+    def test_copy_is_independent(self):
+        """
+        Corner case: changing a copy should not change the original.
+        """
+        decnum = DecimalNumber.from_string("12.5", 10)
+        copy = decnum.copy()
+        copy[0] = 9
+        copy.shift(1)
+        self.assertEqual("12.5", str(decnum))
+        self.assertEqual("195.", str(copy))
+
+    def test_invalid_digit(self):
+        """
+        Error case: digits must be smaller than the base.
+        """
+        decnum = DecimalNumber(10)
+        with self.assertRaises(RuntimeError):
+            decnum[0] = "a"
+
+
 class DecimalNumberComparisonTestCase(unittest.TestCase):
     """
     Test class for infinite-precision numbers.
@@ -558,6 +1634,83 @@ class DecimalNumberComparisonTestCase(unittest.TestCase):
         self.assertFalse(num_1 < num_2)
         self.assertTrue(num_1 == num_2)
 
+    def test_sign_decides(self):
+        """
+        A negative number with a larger magnitude is still smaller.
+        """
+        base = 10
+        num_1 = DecimalNumber.from_string("-" + "9"*500 + ".9", base)
+        num_2 = DecimalNumber.from_string("0.001", base)
+        zero = DecimalNumber.from_string("0.", base)
+
+        self.assertTrue(num_1 < num_2)
+        self.assertTrue(num_1 < zero)
+        self.assertTrue(zero < num_2)
+        self.assertTrue(num_2 >= zero)
+        self.assertFalse(zero > num_2)
+
+    def test_most_significant_pos_decides(self):
+        base = 10
+        num_1 = DecimalNumber.from_string("1" + "0"*300 + ".", base)
+        num_2 = DecimalNumber.from_string("9"*300 + "." + "9"*300, base)
+
+        self.assertTrue(num_1 > num_2)
+        self.assertTrue(num_1 >= num_2)
+        self.assertFalse(num_1 == num_2)
+        num_1.set_sign(-1)
+        num_2.set_sign(-1)
+        self.assertTrue(num_1 < num_2)
+
+    def test_long_equal(self):
+        """
+        Equal numbers built in different ways, including the int backend.
+        """
+        base = 10
+        digits = "3141592653"*100
+        num_1 = DecimalNumber.from_string(digits + ".5", base)
+        num_2 = DecimalNumber.from_string(digits + ".50", base)
+        num_3 = int_backed(int(digits + "5"), base)
+        num_3.shift(-1)
+
+        self.assertTrue(num_1 == num_2)
+        self.assertTrue(num_1 == num_3)
+        self.assertTrue(num_3 >= num_1)
+        self.assertFalse(num_3 > num_1)
+        self.assertFalse(num_1 < num_3)
+
+    def test_int_backend_far_apart(self):
+        """
+        Corner case: int-backed numbers whose exponents differ by millions
+        are compared on their most significant positions,
+        without aligning the mantissas.
+        """
+        base = 10
+        small = int_backed(1, base).shifted(-2_000_000)
+        large = int_backed(1, base).shifted(2_000_000)
+
+        self.assertTrue(small < large)
+        self.assertTrue(large > small)
+        self.assertFalse(small == large)
+        small.set_sign(-1)
+        large.set_sign(-1)
+        self.assertTrue(small > large)
+
+    def test_int_backend_top_position_boundaries(self):
+        """
+        Corner case: mantissas just below and at a power of the base,
+        where the estimated most significant position may be off by one.
+        """
+        for base in (2, 3, 10, 16, 34):
+            for length in (1, 50, 999):
+                power = int_backed(base**length, base)
+                below = int_backed(base**length - 1, base)
+                digits = DecimalNumber.from_string(str(power), base)
+
+                self.assertTrue(below < power)
+                self.assertTrue(below < digits)
+                self.assertTrue(power == digits)
+                self.assertTrue(power.shifted(-1) <= below)
+
 
 
 if __name__ == "__main__":
@@ -0,0 +1,93 @@
+"""
+Copyright (C) 2021 Lulof Pirée, 
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from fractions import Fraction
+from itertools import islice
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from square_roots.compute_square_root import iter_square_root_digits
+
+if np is not None:
+    from square_roots.batch_square_root import compute_square_roots
+
+
+@unittest.skipIf(np is None, "requires NumPy")
+class ComputeSquareRootsTestCase(unittest.TestCase):
+    """
+    Test the NumPy batch computation of square roots.
+    """
+
+    def test_matches_digit_stream(self):
+        """
+        Base case: every row equals the digits of the scalar algorithm.
+        """
+        ks = [2, 3, 0.25, 10000, 12345.678, 0]
+        for base in (2, 10, 16, 34):
+            result = compute_square_roots(ks, 20, base)
+            self.assertEqual((len(ks), 20), result.shape)
+            for k, row in zip(ks, result):
+                expected = list(islice(iter_square_root_digits(k, base), 20))
+                self.assertListEqual(expected, row.tolist())
+
+    def test_mixed_types(self):
+        """
+        Corner case: floats, ints, Fractions and strings in one batch
+        are each read as they are, not coerced to a common type.
+        """
+        for ks in ([0.25, "4"], [1e-20, "2", 0.1, 7],
+                   [Fraction(1, 3), 0.1, "0.1"]):
+            for base in (10, 16):
+                result = compute_square_roots(ks, 12, base)
+                for k, row in zip(ks, result):
+                    expected = list(islice(iter_square_root_digits(k, base),
+                                           12))
+                    self.assertListEqual(expected, row.tolist())
+
+    def test_numpy_input(self):
+        """
+        Base case: ks may be a NumPy array.
+        """
+        result = compute_square_roots(np.array([2.0, 9.0]), 4)
+        np.testing.assert_array_equal([[1, 4, 1, 4], [3, 0, 0, 0]], result)
+        self.assertEqual(np.int64, result.dtype)
+
+    def test_huge_integer_part(self):
+        """
+        Corner case: integer parts beyond 64 bits fall back to dtype=object.
+        """
+        result = compute_square_roots([10**40], 2)
+        self.assertEqual(10**20, result[0, 0])
+
+    def test_invalid_arguments(self):
+        """
+        Error cases: negative k, too few digits, unsupported base.
+        """
+        with self.assertRaises(ValueError):
+            compute_square_roots([2, -2], 3)
+        with self.assertRaises(ValueError):
+            compute_square_roots([2], 0)
+        with self.assertRaises(ValueError):
+            compute_square_roots([2], 3, base=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
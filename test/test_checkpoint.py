@@ -0,0 +1,91 @@
+"""
+Copyright (C) 2021 Lulof Pirée, 
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import tempfile
+import unittest
+
+from square_roots.checkpoint import (compute_square_root_resumable,
+                                     load_checkpoint, save_checkpoint)
+from square_roots.compute_square_root import (compute_square_root,
+                                              SquareRootState)
+
+
+class CheckpointTestCase(unittest.TestCase):
+    """
+    Test writing and resuming checkpoints of square root computations.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "sqrt.ckpt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """
+        Base case: a loaded checkpoint continues with the same digits.
+        """
+        state = SquareRootState(2, 16)
+        state.advance(30)
+        save_checkpoint(self.path, 2, state)
+        loaded = load_checkpoint(self.path, 2, 16)
+        self.assertEqual(30, loaded.position)
+        state.advance(10)
+        loaded.advance(10)
+        self.assertEqual(state.root, loaded.root)
+        self.assertEqual(state.remainder, loaded.remainder)
+
+    def test_resume(self):
+        """
+        Base case: a later call continues from the checkpoint file.
+        """
+        result = compute_square_root_resumable(40, 3, 10, self.path,
+                                               checkpoint_interval=7)
+        self.assertEqual(compute_square_root(40, 3), result)
+        self.assertEqual(40, load_checkpoint(self.path, 3, 10).position)
+        result = compute_square_root_resumable(90, 3, 10, self.path)
+        self.assertEqual(compute_square_root(90, 3), result)
+
+    def test_fewer_digits_than_checkpoint(self):
+        """
+        Corner case: a checkpoint with more digits than asked for.
+        """
+        compute_square_root_resumable(40, 3, 10, self.path)
+        result = compute_square_root_resumable(5, 3, 10, self.path)
+        self.assertEqual("1.7320", result)
+
+    def test_missing_file(self):
+        """
+        Corner case: no checkpoint file yet.
+        """
+        self.assertIsNone(load_checkpoint(self.path, 2, 10))
+
+    def test_other_computation(self):
+        """
+        Error case: a checkpoint of another k or base is rejected.
+        """
+        compute_square_root_resumable(10, 2, 10, self.path)
+        with self.assertRaises(ValueError):
+            load_checkpoint(self.path, 3, 10)
+        with self.assertRaises(ValueError):
+            load_checkpoint(self.path, 2, 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
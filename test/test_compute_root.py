@@ -0,0 +1,111 @@
+"""
+Copyright (C) 2021 Lulof Pirée, 
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from fractions import Fraction
+import unittest
+from unittest import mock
+
+from square_roots.compute_root import (compute_power, compute_root,
+                                       _exact_root, _iroot, _newton_root)
+from square_roots.compute_square_root import compute_square_root, to_ratio
+import square_roots.radix
+
+
+class ComputeRootTestCase(unittest.TestCase):
+    """
+    Test numerical computation of nth roots and rational powers.
+    """
+
+    def test_cube_root_dec(self):
+        """
+        Base case: the first 30 digits of the cube root of 2 are
+        '1.25992104989487316476721060727'.
+        """
+        self.assertEqual("1.25992104989487316476721060727",
+                         compute_root(30, 2, 3))
+
+    def test_fourth_root_exact(self):
+        """
+        Base case: the fourth root of 16 is exactly 2.
+        """
+        self.assertEqual("2.0000", compute_root(5, 16, 4))
+
+    def test_square_root(self):
+        """
+        Base case: n=2 agrees with compute_square_root(),
+        for both engines.
+        """
+        for num_digits in (20, 300):
+            self.assertEqual(compute_square_root(num_digits, 5, 16),
+                             compute_root(num_digits, 5, 2, 16))
+
+    def test_engines_agree(self):
+        """
+        Base case: the digit-by-digit and Newton engines give the same root.
+        """
+        for base in (2, 10, 34):
+            for n in (1, 3, 4, 7):
+                for k in (2, 0.25, 10000, Fraction(1, 3)):
+                    ratio = to_ratio(k, base)
+                    self.assertEqual(_exact_root(200, ratio, n, base),
+                                     _newton_root(200, ratio, n, base))
+
+    def test_iroot(self):
+        """
+        Base case: integer roots of large numbers, exact powers included.
+        """
+        for n in (3, 5, 11):
+            for a in (7**300, 7**300 - 1, 7**300 + 1, 2**5000 + 12345):
+                root = _iroot(a, n)
+                self.assertLessEqual(root**n, a)
+                self.assertGreater((root + 1)**n, a)
+
+    def test_iroot_newton_division(self):
+        """
+        Base case: integer roots agree when the divisions of the
+        Newton iteration use reciprocals.
+        """
+        with mock.patch.object(square_roots.radix,
+                               "NEWTON_DIVISION_THRESHOLD", 100):
+            for n in (3, 5):
+                for a in (3**40000, 3**40000 - 1, 2**60000 + 987):
+                    root = _iroot(a, n)
+                    self.assertLessEqual(root**n, a)
+                    self.assertGreater((root + 1)**n, a)
+
+    def test_power(self):
+        """
+        Base case: 2**(3/2) = 2.8284271247461900976...,
+        and negative exponents.
+        """
+        self.assertEqual("2.8284271247461900976", compute_power(20, 2, 3, 2))
+        self.assertEqual("0.5000", compute_power(5, 4, -1, 2))
+
+    def test_invalid_arguments(self):
+        """
+        Error cases: negative k, degree 0, 0 to a negative power.
+        """
+        with self.assertRaises(ValueError):
+            compute_root(3, -8, 3)
+        with self.assertRaises(ValueError):
+            compute_root(3, 8, 0)
+        with self.assertRaises(ValueError):
+            compute_power(3, 0, -1, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Copyright (C) 2021 Lulof Pirée, 
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from itertools import islice, repeat
+import time
+import unittest
+
+from square_roots.compute_square_root import compute_square_root
+from square_roots.parallel_square_root import (compute_square_roots_parallel,
+                                               unpack_square_root)
+
+JOBS = [(2, 50, 10), (3, 20, 16), (0.25, 4, 10), (10000, 300, 34),
+        (5, 1, 2), (7, 120, 10), (0, 3, 10)]
+
+
+class ParallelSquareRootTestCase(unittest.TestCase):
+    """
+    Test computing square roots on a process pool.
+    """
+
+    def test_ordered(self):
+        """
+        Base case: results are yielded in the order of the jobs.
+        """
+        results = list(compute_square_roots_parallel(JOBS, max_workers=2,
+                                                     chunksize=3))
+        expected = [(i, compute_square_root(n, k, b))
+                    for i, (k, n, b) in enumerate(JOBS)]
+        self.assertListEqual(expected, results)
+
+    def test_as_completed(self):
+        """
+        Base case: unordered results still carry the index of their job.
+        """
+        results = dict(compute_square_roots_parallel(JOBS, max_workers=2,
+                                                     chunksize=2,
+                                                     ordered=False))
+        self.assertEqual(len(JOBS), len(results))
+        for i, (k, n, b) in enumerate(JOBS):
+            self.assertEqual(compute_square_root(n, k, b), results[i])
+
+    def test_packed(self):
+        """
+        Base case: packed results unpack to the output strings.
+        """
+        results = compute_square_roots_parallel(JOBS, max_workers=2,
+                                                packed=True)
+        for i, packed in results:
+            k, n, b = JOBS[i]
+            self.assertIsInstance(packed, bytes)
+            self.assertEqual(compute_square_root(n, k, b),
+                             unpack_square_root(packed, n, b))
+
+    def test_endless_jobs(self):
+        """
+        Corner case: only a bounded amount of jobs is taken
+        ahead of the consumer, so jobs may be endless.
+        """
+        taken = 0
+
+        def jobs():
+            nonlocal taken
+            for job in repeat((2, 10, 10)):
+                taken += 1
+                yield job
+
+        results = compute_square_roots_parallel(jobs(), max_workers=2,
+                                                chunksize=3, max_pending=2)
+        self.assertListEqual([(0, "1.414213562"), (1, "1.414213562")],
+                             list(islice(results, 2)))
+        results.close()
+        # Two pending chunks, and one chunk that was taken to replace
+        # the first yielded chunk.
+        self.assertLessEqual(taken, 3 * 3)
+
+    def test_close_early(self):
+        """
+        Corner case: closing the generator does not wait for all jobs.
+        """
+        jobs = [(2, 40000, 10)] * 40
+        begin = time.perf_counter()
+        results = compute_square_roots_parallel(jobs, max_workers=1,
+                                                chunksize=1)
+        next(results)
+        results.close()
+        single = time.perf_counter() - begin
+        begin = time.perf_counter()
+        compute_square_root(40000, 2)
+        self.assertLess(single, 10 * (time.perf_counter() - begin) + 1)
+
+    def test_invalid_max_pending(self):
+        with self.assertRaises(ValueError):
+            list(compute_square_roots_parallel(JOBS, max_pending=0))
+
+    def test_invalid_job(self):
+        """
+        Error case: errors in a worker are raised to the caller.
+        """
+        with self.assertRaises(ValueError):
+            list(compute_square_roots_parallel([(-2, 3, 10)], max_workers=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Copyright (C) 2021 Lulof Pirée, 
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import unittest
+
+from square_roots.compute_square_root import compute_square_root
+from square_roots.root_cache import SquareRootCache
+
+
+class SquareRootCacheTestCase(unittest.TestCase):
+    """
+    Test the LRU cache of square root computations.
+    """
+
+    def test_extend_prefix(self):
+        """
+        Base case: growing precisions of the same root are all hits
+        after the first request, and give the same digits as
+        compute_square_root().
+        """
+        cache = SquareRootCache()
+        for num_digits in (5, 50, 20, 400, 3):
+            self.assertEqual(compute_square_root(num_digits, 2),
+                             cache.compute_square_root(num_digits, 2))
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(4, cache.hits)
+        self.assertEqual(1, len(cache))
+
+    def test_keys(self):
+        """
+        Base case: different bases are different entries,
+        equal values of k are the same entry.
+        """
+        cache = SquareRootCache()
+        cache.compute_square_root(10, 2)
+        cache.compute_square_root(10, 2.0)
+        cache.compute_square_root(10, 2, base=16)
+        self.assertEqual(2, len(cache))
+        self.assertEqual(1, cache.hits)
+
+    def test_eviction(self):
+        """
+        Corner case: the least recently used state is evicted first.
+        """
+        cache = SquareRootCache()
+        cache.compute_square_root(1000, 2)
+        cache.compute_square_root(1000, 3)
+        cache.max_bytes = cache.size
+        cache.compute_square_root(10, 2)
+        cache.compute_square_root(1000, 5)
+        self.assertEqual(2, len(cache))
+        self.assertLessEqual(cache.size, cache.max_bytes)
+        hits, misses = cache.hits, cache.misses
+        cache.compute_square_root(10, 2)
+        self.assertEqual(hits + 1, cache.hits)
+        cache.compute_square_root(10, 3)
+        self.assertEqual(misses + 1, cache.misses)
+
+
+if __name__ == "__main__":
+    unittest.main()
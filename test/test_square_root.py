@@ -15,9 +15,24 @@ You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+from fractions import Fraction
+from itertools import islice
+import math
+import random
 import unittest
 
-from square_roots.compute_square_root import compute_square_root
+from square_roots.compute_square_root import (compute_square_root,
+                                              iter_square_root_digits,
+                                              SquareRootState,
+                                              NEWTON_THRESHOLD,
+                                              _exact_square_root,
+                                              _newton_square_root,
+                                              to_fraction,
+                                              to_ratio)
+import square_roots.compute_square_root
+from square_roots.decimal_num import DecimalNumber
+import square_roots.radix
+from square_roots.radix import _floor_divide, digits_to_int, int_to_digits
 
 class ComputeSquareRootTestCase(unittest.TestCase):
     """
@@ -77,5 +92,306 @@ class ComputeSquareRootTestCase(unittest.TestCase):
         of sqrt(2) are 1.01101.
         """
         self.run_test(num_digits=6, k=2, base=2, expected="1.01101")
+
+    def test_fifty_digit_dec(self):
+        """
+        Base case: more digits than float precision allows.
+        The first 50 digits of sqrt(2) are
+        '1.4142135623730950488016887242096980785696718753769'.
+        """
+        self.run_test(num_digits=50, k=2,
+                      expected="1.4142135623730950488016887242096980785696718753769")
+
+    def test_many_digits_hex(self):
+        """
+        Corner case: digits greater than 9 should be written as letters.
+        """
+        self.run_test(num_digits=41, k=2, base=16,
+                      expected="1.6a09e667f3bcc908b2fb1366ea957d3e3adec175")
+
+    def test_large_integer_part(self):
+        """
+        Corner case: sqrt(10000) = 100 has more than one integer digit.
+        """
+        self.run_test(num_digits=4, k=10000, expected="100.000")
+
+    def test_fraction_input(self):
+        """
+        Corner case: sqrt(0.25) = 0.5 has no nonzero integer digit.
+        """
+        self.run_test(num_digits=4, k=0.25, expected="0.500")
+
+    def test_largest_base(self):
+        """
+        Corner case: base 34 uses every digit symbol up to "x".
+        """
+        self.run_test(num_digits=30, k=2, base=34,
+                      expected="1.e2s8gsav4gugmww4xgcwcpg48krkc")
+
+    def test_float_algorithm_base_32(self):
+        """
+        Base case: the float-based algorithm in a large base.
+        """
+        result = compute_square_root(12, 2, 32, exact=False)
+        self.assertEqual("1.d84ucpvjnj4", result)
+
+    def test_float_algorithm(self):
+        """
+        Base case: the float-based algorithm is still available.
+        """
+        result = compute_square_root(11, 2, 10, exact=False)
+        self.assertEqual("1.4142135623", result)
+
+    def test_float_algorithm_letter_integer_part(self):
+        """
+        Corner case: the integer digit is written as a letter, as in
+        the exact algorithm.
+        """
+        result = compute_square_root(4, 150, 16, exact=False)
+        self.assertEqual(compute_square_root(4, 150, 16), result)
+        self.assertEqual("c.3f5", result)
+
+    def test_float_algorithm_large_integer_part(self):
+        """
+        Error case: the float-based algorithm has a single integer digit,
+        so it rejects sqrt(k) >= base instead of returning 9.99.
+        """
+        with self.assertRaises(ValueError):
+            compute_square_root(3, 10000, exact=False)
+        with self.assertRaises(ValueError):
+            compute_square_root(3, 256, 16, exact=False)
+        self.assertEqual("f.ff", compute_square_root(3, 255.99, 16,
+                                                     exact=False))
+
+    def test_invalid_arguments(self):
+        """
+        Error cases: negative k, too few digits, unsupported base.
+        """
+        with self.assertRaises(ValueError):
+            compute_square_root(3, -2)
+        with self.assertRaises(ValueError):
+            compute_square_root(0, 2)
+        with self.assertRaises(ValueError):
+            compute_square_root(3, 2, base=35)
+
+
+class ExactInputTestCase(unittest.TestCase):
+    """
+    Test inputs of compute_square_root() that are not floats.
+    """
+
+    def test_big_int(self):
+        """
+        Base case: an int beyond float precision is not rounded.
+        sqrt(10**40 + 1) = 10**20 + 0.5e-20 - ...
+        """
+        result = compute_square_root(23, 10**40 + 1)
+        self.assertEqual("1" + "0"*20 + "." + "0"*20 + "49", result)
+
+    def test_fraction(self):
+        """
+        Base case: sqrt(1/9) = 0.333...
+        """
+        self.assertEqual("0." + "3"*30, compute_square_root(31, Fraction(1, 9)))
+
+    def test_string(self):
+        """
+        Base case: strings are read in the output base,
+        so the output of one computation can be the next input.
+        """
+        root = compute_square_root(60, 2, base=16)
+        self.assertEqual(Fraction(2), to_fraction("2.", 16))
+        self.assertEqual(Fraction(-31, 16), to_fraction("-1.f", 16))
+        self.assertEqual(compute_square_root(30, 2**0.5, 16)[:14],
+                         compute_square_root(30, root, 16)[:14])
+        self.assertEqual("1.414", compute_square_root(4, "2", 10))
+
+    def test_decimal_number(self):
+        """
+        Base case: DecimalNumbers in any base.
+        """
+        number = DecimalNumber.from_string("2.25", 10)
+        self.assertEqual("1.5000", compute_square_root(5, number))
+        number = DecimalNumber.from_string("100.", 2)
+        self.assertEqual("2.0000", compute_square_root(5, number))
+
+    def test_to_ratio(self):
+        """
+        Base case: to_ratio() is exact but does not reduce to lowest terms,
+        for every accepted type, including int-backed DecimalNumbers.
+        """
+        self.assertEqual((25, 10), to_ratio("2.5", 10))
+        self.assertEqual((-31, 16), to_ratio("-1.f", 16))
+        self.assertEqual((12, 1), to_ratio(12))
+        self.assertEqual((1, 4), to_ratio(0.25))
+        self.assertEqual((2, 6), to_ratio(DecimalNumber.from_string("0.2", 6)))
+        number = DecimalNumber.from_int(-7, 10).shifted(-3)
+        self.assertEqual((-7, 1000), to_ratio(number))
+        number.enable_int_backend()
+        self.assertEqual((-7, 1000), to_ratio(number))
+        number = DecimalNumber.from_int(7, 3).shifted(2)
+        number.enable_int_backend()
+        self.assertEqual((63, 1), to_ratio(number))
+        self.assertEqual((0, 1), to_ratio(DecimalNumber(10)))
+
+    def test_invalid_strings(self):
+        """
+        Error cases: malformed strings, digits beyond the base,
+        negative numbers. The errors are those of DecimalNumber.from_string().
+        """
+        for invalid in ("1.2.3", ".5", "", "-", "1 2", "1.é"):
+            with self.subTest(invalid=invalid):
+                with self.assertRaises(ValueError):
+                    compute_square_root(3, invalid)
+        with self.assertRaises(RuntimeError):
+            compute_square_root(3, "1a", base=10)
+        with self.assertRaises(RuntimeError):
+            DecimalNumber.from_string("1a.", 10)
+        with self.assertRaises(ValueError):
+            compute_square_root(3, "-4")
+        self.assertEqual("2.00", compute_square_root(3, " 4 \n"))
+        self.assertEqual("2.00", compute_square_root(3, "4."))
+        self.assertEqual("1.cd", compute_square_root(3, "3.4", 16))
+
+
+class SquareRootDigitStreamTestCase(unittest.TestCase):
+    """
+    Test the streaming computation of digits of square roots.
+    """
+
+    def test_iter_digits_dec(self):
+        """
+        Base case: the first digits of sqrt(2) are 1, 4, 1, 4, 2, 1.
+        """
+        result = list(islice(iter_square_root_digits(2), 6))
+        self.assertListEqual([1, 4, 1, 4, 2, 1], result)
+
+    def test_iter_digits_hex(self):
+        """
+        Base case: the first digits of sqrt(2) in base 16 are 1.6a09e.
+        """
+        result = list(islice(iter_square_root_digits(2, base=16), 6))
+        self.assertListEqual([1, 6, 10, 0, 9, 14], result)
+
+    def test_pause_and_continue(self):
+        """
+        Corner case: stopping the iteration and continuing later
+        should neither skip nor repeat digits.
+        """
+        state = SquareRootState(3)
+        first = list(islice(state.iter_digits(), 4))
+        self.assertEqual(4, state.position)
+        self.assertEqual(1732, state.root)
+        second = list(islice(state.iter_digits(), 4))
+        self.assertListEqual([1, 7, 3, 2, 0, 5, 0, 8], first + second)
+        self.assertEqual(state.remainder, 3*10**14 - state.root**2)
+
+    def test_integer_part_first(self):
+        """
+        Corner case: the first value yielded is the whole integer part.
+        """
+        result = list(islice(iter_square_root_digits(400), 3))
+        self.assertListEqual([20, 0, 0], result)
+
+
+class NewtonSquareRootTestCase(unittest.TestCase):
+    """
+    Test the Newton engine used for many digits.
+    """
+
+    def test_matches_digit_engine(self):
+        """
+        Base case: both exact engines give the same digits,
+        also far beyond the precision of math.isqrt()'s fast path.
+        """
+        for base in (2, 10, 16, 34):
+            for k in (2, 3, 0.25, 10000, 12345.678):
+                ratio = to_ratio(k, base)
+                self.assertEqual(_exact_square_root(1500, ratio, base),
+                                 _newton_square_root(1500, ratio, base))
+
+    def test_above_threshold(self):
+        """
+        Base case: compute_square_root() switches engines
+        without changing the output.
+        """
+        num_digits = NEWTON_THRESHOLD + 50
+        result = compute_square_root(num_digits, 2)
+        self.assertEqual(num_digits + 1, len(result))
+        self.assertTrue(result.startswith(
+            "1.4142135623730950488016887242096980785696718753769"))
+
+    def test_isqrt(self):
+        """
+        Base case: _isqrt() agrees with math.isqrt(),
+        also for (neighbours of) perfect squares.
+        """
+        module = square_roots.compute_square_root
+        threshold = module._ISQRT_THRESHOLD
+        module._ISQRT_THRESHOLD = 1000
+        self.addCleanup(setattr, module, "_ISQRT_THRESHOLD", threshold)
+        generator = random.Random(4)
+        for bits in (1002, 20000, 100001):
+            root = generator.getrandbits(bits // 2) | 1 << (bits // 2 - 1)
+            for n in (root*root - 1, root*root, root*root + 1,
+                      generator.getrandbits(bits)):
+                self.assertEqual(math.isqrt(n), module._isqrt(n))
+
+    def test_perfect_square(self):
+        """
+        Corner case: no correction may push an exact root off by one.
+        """
+        result = compute_square_root(3000, 10**40)
+        self.assertEqual("1" + "0"*20 + "." + "0"*2999, result)
+
+
+class RadixTestCase(unittest.TestCase):
+    """
+    Test conversion between ints and lists of digits.
+    """
+
+    def test_round_trip(self):
+        """
+        Base case: int_to_digits() and digits_to_int() are inverses.
+        """
+        value = 3**5000
+        for base in (2, 10, 16, 34):
+            digits = int_to_digits(value, base)
+            self.assertNotEqual(0, digits[0])
+            self.assertEqual(value, digits_to_int(digits, base))
+
+    def test_padding(self):
+        """
+        Corner case: zero and padding with leading zeros.
+        """
+        self.assertListEqual([0], int_to_digits(0, 10))
+        self.assertListEqual([0, 0, 1, 2], int_to_digits(12, 10, 4))
+
+    def test_newton_division(self):
+        """
+        Base case: with a low threshold, the splits and _floor_divide()
+        use Newton reciprocals, and give the same results.
+        """
+        threshold = square_roots.radix.NEWTON_DIVISION_THRESHOLD
+        square_roots.radix.NEWTON_DIVISION_THRESHOLD = 100
+        self.addCleanup(setattr, square_roots.radix,
+                        "NEWTON_DIVISION_THRESHOLD", threshold)
+        value = 7**20000 - 1
+        for base in (2, 10, 34):
+            digits = int_to_digits(value, base)
+            self.assertEqual(value, digits_to_int(digits, base))
+            self.assertEqual(len(digits), len(int_to_digits(value - 1, base)))
+        expected = []
+        remaining = value
+        while remaining > 0:
+            remaining, digit = divmod(remaining, 10)
+            expected.append(digit)
+        self.assertListEqual(expected[::-1], int_to_digits(value, 10))
+        for divisor in (3**5000, 3**5000 + 1, 2**300, 10**9000 - 1):
+            self.assertEqual(value // divisor, _floor_divide(value, divisor))
+            self.assertEqual(value*divisor // divisor,
+                             _floor_divide(value*divisor, divisor))
+
+
 if __name__ == "__main__":
     unittest.main()